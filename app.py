@@ -1,10 +1,23 @@
 import streamlit as st
 import zipfile
-import io
 import json
 import datetime
 import re
+import hashlib
+import html
+import dis
+import types
+import uuid
 import requests
+from markdown_lite import MARKDOWN_JS, format_text
+from store_catalog import CATALOG_JS, CSV_LINE_JS, index_catalog
+from landing_pages import lp_token, parse_locations, render_landing_pages
+from artifact_cache import ARTIFACTS
+from build_queue import BUILDS
+from host_config import render_host_configs
+from package_zip import PackageZip
+from image_pipeline import data_uri, image_stem, pick_variant, process_images, read_local_image, srcset
+from themes import ANIMATIONS, BASE_CSS, BASE_CSS_HREF, CARD_HOVER_BORDER, HERO_ALIGN, THEME_SLUGS, THEME_STORAGE_KEY, THEMES, theme_switch_script, theme_tokens_css
 
 # --- 0. STATE MANAGEMENT ---
 def init_state(key, default_val):
@@ -25,6 +38,36 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- 1.1 EDITOR PANELS ---
+PREVIEW_PAGES = ["Home", "About", "Contact", "Blog Index", "Blog Post (Demo)", "Privacy", "Terms", "Product Detail (Demo)", "Booking Page", "Landing Page (Demo)"]
+APP_RUN = True
+
+def fingerprint(value):
+    # Uploaded files compare by content, so the same upload in any session maps to the same build.
+    if hasattr(value, "getvalue"): return ("file", value.name, hashlib.sha256(value.getvalue()).hexdigest())
+    if isinstance(value, (list, tuple)): return [fingerprint(v) for v in value]
+    return value
+
+def editor_panel(*pages):
+    # Each sidebar panel and tab is an st.fragment: a widget change reruns only that panel, which
+    # republishes its values as module globals. The app (and with it the preview) reruns only when
+    # the page currently previewed depends on the panel; otherwise only a background package build is queued.
+    def wrap(fn):
+        names = [i.argval for i in dis.get_instructions(fn) if i.opname == "STORE_GLOBAL"]
+        key = f"_panel_{fn.__name__}"
+        @st.fragment
+        def panel():
+            fn()
+            sig = repr([fingerprint(globals()[n]) for n in names])
+            changed = st.session_state.get(key, sig) != sig
+            st.session_state[key] = sig
+            if not changed or APP_RUN: return
+            if st.session_state.get("preview_mode", "Home") in pages: st.rerun(scope="app")
+            assemble_site(notify=False)
+            queue_build()
+        return panel
+    return wrap
+
 # --- 2. ADVANCED UI SYSTEM ---
 st.markdown("""
     <style>
@@ -56,86 +99,111 @@ with st.sidebar:
     st.divider()
     
     # --- AI GENERATOR ---
-    with st.expander("🤖 Titan AI Generator", expanded=False):
-        raw_key = st.text_input("Groq API Key", type="password")
-        groq_key = raw_key.strip() if raw_key else ""
-        biz_desc = st.text_input("Business Description")
+    @editor_panel()
+    def ai_generator():
+        with st.expander("🤖 Titan AI Generator", expanded=False):
+            raw_key = st.text_input("Groq API Key", type="password")
+            groq_key = raw_key.strip() if raw_key else ""
+            biz_desc = st.text_input("Business Description")
         
-        if st.button("✨ Generate Copy"):
-            if not groq_key or not biz_desc:
-                st.error("Key & Description required.")
-            else:
-                try:
-                    with st.spinner("Writing Context..."):
-                        url = "https://api.groq.com/openai/v1/chat/completions"
-                        headers = {"Authorization": f"Bearer {groq_key}", "Content-Type": "application/json"}
-                        prompt = f"Act as a copywriter. Return JSON for '{biz_desc}': hero_h, hero_sub, about_h, about_short, feat_data (icon|Title|Desc format)."
-                        data = {"messages": [{"role": "user", "content": prompt}], "model": "llama-3.1-8b-instant", "response_format": {"type": "json_object"}}
-                        resp = requests.post(url, headers=headers, json=data)
-                        if resp.status_code == 200:
-                            res = resp.json()['choices'][0]['message']['content']
-                            parsed = json.loads(res)
-                            if 'hero_h' in parsed: st.session_state.hero_h = str(parsed['hero_h'])
-                            if 'hero_sub' in parsed: st.session_state.hero_sub = str(parsed['hero_sub'])
-                            if 'about_h' in parsed: st.session_state.about_h = str(parsed['about_h'])
-                            if 'about_short' in parsed: st.session_state.about_short = str(parsed['about_short'])
-                            if 'feat_data' in parsed:
-                                if isinstance(parsed['feat_data'], list): st.session_state.feat_data = "\n".join(map(str, parsed['feat_data']))
-                                else: st.session_state.feat_data = str(parsed['feat_data'])
-                            st.success("Generated Successfully!")
-                            st.rerun()
-                except Exception as e: st.error(f"Error: {e}")
+            if st.button("✨ Generate Copy"):
+                if not groq_key or not biz_desc:
+                    st.error("Key & Description required.")
+                else:
+                    try:
+                        with st.spinner("Writing Context..."):
+                            url = "https://api.groq.com/openai/v1/chat/completions"
+                            headers = {"Authorization": f"Bearer {groq_key}", "Content-Type": "application/json"}
+                            prompt = f"Act as a copywriter. Return JSON for '{biz_desc}': hero_h, hero_sub, about_h, about_short, feat_data (icon|Title|Desc format)."
+                            data = {"messages": [{"role": "user", "content": prompt}], "model": "llama-3.1-8b-instant", "response_format": {"type": "json_object"}}
+                            resp = requests.post(url, headers=headers, json=data)
+                            if resp.status_code == 200:
+                                res = resp.json()['choices'][0]['message']['content']
+                                parsed = json.loads(res)
+                                if 'hero_h' in parsed: st.session_state.hero_h = str(parsed['hero_h'])
+                                if 'hero_sub' in parsed: st.session_state.hero_sub = str(parsed['hero_sub'])
+                                if 'about_h' in parsed: st.session_state.about_h = str(parsed['about_h'])
+                                if 'about_short' in parsed: st.session_state.about_short = str(parsed['about_short'])
+                                if 'feat_data' in parsed:
+                                    if isinstance(parsed['feat_data'], list): st.session_state.feat_data = "\n".join(map(str, parsed['feat_data']))
+                                    else: st.session_state.feat_data = str(parsed['feat_data'])
+                                st.success("Generated Successfully!")
+                                st.rerun()
+                    except Exception as e: st.error(f"Error: {e}")
+    ai_generator()
 
     # 3.1 VISUAL DNA & UI VARIATIONS
-    with st.expander("🎨 Design Studio", expanded=True):
-        theme_mode = st.selectbox("Base Theme", ["Clean Corporate (Light)", "Midnight SaaS (Dark)", "Glassmorphism (Blur)", "Cyberpunk Neon", "Luxury Gold", "Forest Eco", "Ocean Breeze", "Stark Minimalist"])
+    @editor_panel(*PREVIEW_PAGES)
+    def design_studio():
+        global theme_mode, enable_theme_switch, p_color, s_color, btn_txt_color, hero_layout, btn_style, border_rad, card_hover_style, overlay_opacity, anim_type, h_font, b_font
+        with st.expander("🎨 Design Studio", expanded=True):
+            theme_mode = st.selectbox("Base Theme", list(THEMES))
+            enable_theme_switch = st.checkbox("Visitor Theme Switcher", value=False, help="Ships every base theme (under 1 KB) so the 🌓 button cycles through them in the browser, no rebuild needed.")
         
-        c1, c2, c3 = st.columns(3)
-        p_color = c1.color_picker("Primary Brand", "#0F172A") 
-        s_color = c2.color_picker("Action (CTA)", "#EF4444")  
-        btn_txt_color = c3.color_picker("Btn Text", "#FFFFFF")
+            c1, c2, c3 = st.columns(3)
+            p_color = c1.color_picker("Primary Brand", "#0F172A") 
+            s_color = c2.color_picker("Action (CTA)", "#EF4444")  
+            btn_txt_color = c3.color_picker("Btn Text", "#FFFFFF")
         
-        st.markdown("**Layout & Physics**")
-        hero_layout = st.selectbox("Hero Alignment", ["Center", "Left"])
-        btn_style = st.selectbox("Button Style", ["Rounded (Default)", "Sharp (Square)", "Pill (Full Round)"])
-        border_rad = "8px" if btn_style == "Rounded (Default)" else ("0px" if btn_style == "Sharp (Square)" else "50px")
+            st.markdown("**Layout & Physics**")
+            hero_layout = st.selectbox("Hero Alignment", list(HERO_ALIGN))
+            btn_style = st.selectbox("Button Style", ["Rounded (Default)", "Sharp (Square)", "Pill (Full Round)"])
+            border_rad = "8px" if btn_style == "Rounded (Default)" else ("0px" if btn_style == "Sharp (Square)" else "50px")
         
-        card_hover_style = st.selectbox("Card Hover Border", ["Soft Shadow (Modern)", "Primary Color Border", "Accent Color Border (Red)"])
-        overlay_opacity = st.slider("Hero Image Darkness", 0.1, 0.9, 0.5, help="Higher number makes text easier to read over images.")
+            card_hover_style = st.selectbox("Card Hover Border", list(CARD_HOVER_BORDER))
+            overlay_opacity = st.slider("Hero Image Darkness", 0.1, 0.9, 0.5, help="Higher number makes text easier to read over images.")
         
-        anim_type = st.selectbox("Animation Style", ["Fade Up", "Zoom In", "Slide Right", "None"])
-        h_font = st.selectbox("Headings Font", ["Montserrat", "Space Grotesk", "Playfair Display", "Oswald", "Clash Display"])
-        b_font = st.selectbox("Body Font", ["Inter", "Open Sans", "Roboto", "Satoshi", "Lora"])
+            anim_type = st.selectbox("Animation Style", list(ANIMATIONS))
+            h_font = st.selectbox("Headings Font", ["Montserrat", "Space Grotesk", "Playfair Display", "Oswald", "Clash Display"])
+            b_font = st.selectbox("Body Font", ["Inter", "Open Sans", "Roboto", "Satoshi", "Lora"])
+    design_studio()
 
     # 3.2 2050 FEATURE FLAGS
-    with st.expander("🚀 2050 Feature Flags", expanded=True):
-        st.write("Enable Next-Gen Capabilities:")
-        enable_ar = st.checkbox("Spatial Web (AR 3D Models)", value=True, help="Injects <model-viewer> for .glb links in your CSV.")
-        enable_voice = st.checkbox("Voice Command Search", value=True, help="Native browser NLP for store filtering.")
-        enable_context = st.checkbox("Context-Aware UI", value=True, help="Auto dark-mode based on user's local time.")
-        enable_ab = st.checkbox("Edge A/B Testing", value=True, help="Client-side variant testing without tracking cookies.")
+    @editor_panel(*PREVIEW_PAGES)
+    def feature_flags():
+        global enable_ar, enable_voice, enable_context, enable_ab, enable_prefetch, prefetch_budget, ab_variants
+        with st.expander("🚀 2050 Feature Flags", expanded=True):
+            st.write("Enable Next-Gen Capabilities:")
+            enable_ar = st.checkbox("Spatial Web (AR 3D Models)", value=True, help="Injects <model-viewer> for .glb links in your CSV.")
+            enable_voice = st.checkbox("Voice Command Search", value=True, help="Native browser NLP for store filtering.")
+            enable_context = st.checkbox("Context-Aware UI", value=True, help="Auto dark-mode based on user's local time.")
+            enable_ab = st.checkbox("Edge A/B Testing", value=True, help="Client-side variant testing without tracking cookies.")
+            enable_prefetch = st.checkbox("Instant Navigation (Prefetch)", value=True, help="Prefetches pages on hover/touch using Speculation Rules, and hands the product or post data to the next page.")
+            prefetch_budget = st.slider("Prefetch Budget (pages per visit)", 1, 20, 6) if enable_prefetch else 0
+            ab_variants = st.text_area("A/B Variants", "B | #10b981 | |", height=80, help="One variant per line: Name | Accent Color | Hero Headline | Hero Subtext. Leave a field blank to keep the original. Variant A is always the original.") if enable_ab else ""
+    feature_flags()
 
     # 3.3 MODULE MANAGER
-    with st.expander("🧩 Section Manager", expanded=False):
-        show_hero = st.checkbox("Hero Section", value=True)
-        show_stats = st.checkbox("Trust Stats", value=True)
-        show_features = st.checkbox("Feature Grid", value=True)
-        show_pricing = st.checkbox("Pricing Table", value=True)
-        show_inventory = st.checkbox("Store/Inventory", value=True)
-        show_blog = st.checkbox("Blog Engine", value=True)
-        show_gallery = st.checkbox("About Section", value=True)
-        show_testimonials = st.checkbox("Testimonials", value=True)
-        show_faq = st.checkbox("F.A.Q.", value=True)
-        show_cta = st.checkbox("Final CTA", value=True)
-        show_booking = st.checkbox("Booking Engine", value=True)
+    @editor_panel(*PREVIEW_PAGES)
+    def section_manager():
+        global show_hero, show_stats, show_features, show_pricing, show_inventory, show_blog, show_gallery, show_testimonials, show_faq, show_cta, show_booking
+        with st.expander("🧩 Section Manager", expanded=False):
+            show_hero = st.checkbox("Hero Section", value=True)
+            show_stats = st.checkbox("Trust Stats", value=True)
+            show_features = st.checkbox("Feature Grid", value=True)
+            show_pricing = st.checkbox("Pricing Table", value=True)
+            show_inventory = st.checkbox("Store/Inventory", value=True)
+            show_blog = st.checkbox("Blog Engine", value=True)
+            show_gallery = st.checkbox("About Section", value=True)
+            show_testimonials = st.checkbox("Testimonials", value=True)
+            show_faq = st.checkbox("F.A.Q.", value=True)
+            show_cta = st.checkbox("Final CTA", value=True)
+            show_booking = st.checkbox("Booking Engine", value=True)
+    section_manager()
 
     # 3.4 TECHNICAL
-    with st.expander("⚙️ SEO & Analytics", expanded=False):
-        seo_area = st.text_input("Service Area", "Global / Online")
-        seo_kw = st.text_area("SEO Keywords", "web design, no monthly fees")
-        gsc_tag = st.text_input("Google Verification ID")
-        ga_tag = st.text_input("Google Analytics ID")
-        og_image = st.text_input("Social Share Image URL")
+    @editor_panel(*PREVIEW_PAGES)
+    def seo_analytics():
+        global seo_area, locations_csv, seo_kw, gsc_tag, ga_tag, og_image, rum_endpoint
+        with st.expander("⚙️ SEO & Analytics", expanded=False):
+            seo_area = st.text_input("Service Area", "Global / Online")
+            locations_csv = st.file_uploader("Landing Pages CSV", type="csv", help="One landing page per row. Header row with a 'location' column; optional: headline, description, intro, street, city, region, postal_code, country, phone, slug.")
+            seo_kw = st.text_area("SEO Keywords", "web design, no monthly fees")
+            gsc_tag = st.text_input("Google Verification ID")
+            ga_tag = st.text_input("Google Analytics ID")
+            og_image = st.text_input("Social Share Image URL")
+            rum_endpoint = st.text_input("RUM Beacon Endpoint", placeholder="http://localhost:8787/rum", help="Optional. Sends LCP, CLS, INP, TTFB and sheet load timings from real visitors (see rum_collector.py).")
+    seo_analytics()
 
 # --- 4. MAIN WORKSPACE ---
 st.title("🏗️ StopWebRent 2050 Compiler")
@@ -143,159 +211,206 @@ st.title("🏗️ StopWebRent 2050 Compiler")
 tabs = st.tabs(["1. Identity & PWA", "2. Content Blocks", "3. Marketing Tools", "4. Pricing", "5. Store", "6. Booking", "7. Blog", "8. Legal", "9. Web3 / IPFS"])
 
 with tabs[0]:
-    c1, c2 = st.columns(2)
-    with c1:
-        biz_name = st.text_input("Business Name", "StopWebRent.com")
-        biz_tagline = st.text_input("Tagline", "Stop Renting. Start Owning.")
-        biz_phone = st.text_input("Phone", "966572562151")
-        biz_email = st.text_input("Email", "hello@kaydiemscriptlab.com")
-    with c2:
-        prod_url = st.text_input("Website URL", "https://www.stopwebrent.com")
-        biz_addr = st.text_area("Address", "Kaydiem Script Lab\nKolkata, India", height=100)
-        map_iframe = st.text_area("Google Map Embed", placeholder='<iframe src="..."></iframe>', height=100)
-        seo_d = st.text_area("Meta Description", "Stop paying monthly fees for web hosting.", height=100)
-        logo_url = st.text_input("Logo URL (PNG/SVG)")
-
-    st.subheader("📱 Progressive Web App (PWA)")
-    pwa_short = st.text_input("App Short Name", biz_name[:12])
-    pwa_desc = st.text_input("App Description", "Official App")
-    pwa_icon = st.text_input("App Icon (512x512 PNG)", logo_url)
+    @editor_panel(*PREVIEW_PAGES)
+    def identity_tab():
+        global biz_name, biz_tagline, biz_phone, biz_email, prod_url, biz_addr, map_iframe, seo_d, logo_url, pwa_short, pwa_desc, pwa_icon, image_uploads, lang_sheet, fb_link, ig_link, x_link, li_link, yt_link, wa_num
+        c1, c2 = st.columns(2)
+        with c1:
+            biz_name = st.text_input("Business Name", "StopWebRent.com")
+            biz_tagline = st.text_input("Tagline", "Stop Renting. Start Owning.")
+            biz_phone = st.text_input("Phone", "966572562151")
+            biz_email = st.text_input("Email", "hello@kaydiemscriptlab.com")
+        with c2:
+            prod_url = st.text_input("Website URL", "https://www.stopwebrent.com")
+            biz_addr = st.text_area("Address", "Kaydiem Script Lab\nKolkata, India", height=100)
+            map_iframe = st.text_area("Google Map Embed", placeholder='<iframe src="..."></iframe>', height=100)
+            seo_d = st.text_area("Meta Description", "Stop paying monthly fees for web hosting.", height=100)
+            logo_url = st.text_input("Logo URL (PNG/SVG)")
+
+        st.subheader("📱 Progressive Web App (PWA)")
+        pwa_short = st.text_input("App Short Name", biz_name[:12])
+        pwa_desc = st.text_input("App Description", "Official App")
+        pwa_icon = st.text_input("App Icon (512x512 PNG)", logo_url)
+    
+        st.subheader("🖼️ Image Assets")
+        image_uploads = st.file_uploader("Upload Images", type=["png", "jpg", "jpeg", "webp", "gif", "avif"], accept_multiple_files=True, help="Type an uploaded file's name into any image field: logo, app icon, share image, hero slides, about image, default product image or Store CSV column D (column D only with \"Snapshot catalog at build time\" on). Those images are bundled as resized WebP/AVIF files with blur placeholders. Server-side paths work only for files inside the folder set in TITAN_IMAGE_DIR.")
     
-    st.subheader("🌍 Multi-Language")
-    lang_sheet = st.text_input("Translation Sheet CSV URL")
+        st.subheader("🌍 Multi-Language")
+        lang_sheet = st.text_input("Translation Sheet CSV URL")
         
-    st.subheader("Social Links")
-    sc1, sc2, sc3 = st.columns(3)
-    fb_link = sc1.text_input("Facebook URL")
-    ig_link = sc2.text_input("Instagram URL")
-    x_link = sc3.text_input("X (Twitter) URL")
-    sc4, sc5, sc6 = st.columns(3)
-    li_link = sc4.text_input("LinkedIn URL")
-    yt_link = sc5.text_input("YouTube URL")
-    wa_num = sc6.text_input("WhatsApp Number (No +)", "966572562151")
+        st.subheader("Social Links")
+        sc1, sc2, sc3 = st.columns(3)
+        fb_link = sc1.text_input("Facebook URL")
+        ig_link = sc2.text_input("Instagram URL")
+        x_link = sc3.text_input("X (Twitter) URL")
+        sc4, sc5, sc6 = st.columns(3)
+        li_link = sc4.text_input("LinkedIn URL")
+        yt_link = sc5.text_input("YouTube URL")
+        wa_num = sc6.text_input("WhatsApp Number (No +)", "966572562151")
+    identity_tab()
 
 with tabs[1]:
-    st.subheader("Hero Carousel")
-    hero_h = st.text_input("Hero Headline", key="hero_h")
-    hero_sub = st.text_input("Hero Subtext", key="hero_sub")
-    hero_video_id = st.text_input("YouTube Video ID (Background Override)", placeholder="e.g. dQw4w9WgXcQ")
+    @editor_panel("Home", "About", "Blog Index", "Landing Page (Demo)")
+    def content_tab():
+        global hero_h, hero_sub, hero_video_id, hero_img_1, hero_img_2, hero_img_3, stat_1, label_1, stat_2, label_2, stat_3, label_3, f_title, feat_data_input, about_h_in, about_img, about_short_in, about_long
+        st.subheader("Hero Carousel")
+        hero_h = st.text_input("Hero Headline", key="hero_h")
+        hero_sub = st.text_input("Hero Subtext", key="hero_sub")
+        hero_video_id = st.text_input("YouTube Video ID (Background Override)", placeholder="e.g. dQw4w9WgXcQ")
     
-    hc1, hc2, hc3 = st.columns(3)
-    hero_img_1 = hc1.text_input("Slide 1", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=1600")
-    hero_img_2 = hc2.text_input("Slide 2", "https://images.unsplash.com/photo-1551288049-bebda4e38f71?q=80&w=1600")
-    hero_img_3 = hc3.text_input("Slide 3", "https://images.unsplash.com/photo-1526374965328-7f61d4dc18c5?q=80&w=1600")
+        hc1, hc2, hc3 = st.columns(3)
+        hero_img_1 = hc1.text_input("Slide 1", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=1600")
+        hero_img_2 = hc2.text_input("Slide 2", "https://images.unsplash.com/photo-1551288049-bebda4e38f71?q=80&w=1600")
+        hero_img_3 = hc3.text_input("Slide 3", "https://images.unsplash.com/photo-1526374965328-7f61d4dc18c5?q=80&w=1600")
     
-    st.divider()
-    st.subheader("Stats & Features")
-    col_s1, col_s2, col_s3 = st.columns(3)
-    stat_1 = col_s1.text_input("Stat 1", "0.1s")
-    label_1 = col_s1.text_input("Label 1", "Speed")
-    stat_2 = col_s2.text_input("Stat 2", "$0")
-    label_2 = col_s2.text_input("Label 2", "Fees")
-    stat_3 = col_s3.text_input("Stat 3", "100%")
-    label_3 = col_s3.text_input("Label 3", "Ownership")
-
-    f_title = st.text_input("Features Title", "Value Pillars")
-    feat_data_input = st.text_area("Features List", key="feat_data", height=150)
+        st.divider()
+        st.subheader("Stats & Features")
+        col_s1, col_s2, col_s3 = st.columns(3)
+        stat_1 = col_s1.text_input("Stat 1", "0.1s")
+        label_1 = col_s1.text_input("Label 1", "Speed")
+        stat_2 = col_s2.text_input("Stat 2", "$0")
+        label_2 = col_s2.text_input("Label 2", "Fees")
+        stat_3 = col_s3.text_input("Stat 3", "100%")
+        label_3 = col_s3.text_input("Label 3", "Ownership")
+
+        f_title = st.text_input("Features Title", "Value Pillars")
+        feat_data_input = st.text_area("Features List", key="feat_data", height=150)
     
-    st.subheader("About")
-    about_h_in = st.text_input("About Title", key="about_h")
-    about_img = st.text_input("About Image", "https://images.unsplash.com/photo-1543286386-713df548e9cc?q=80&w=1600")
-    about_short_in = st.text_area("Short Summary", key="about_short", height=100)
-    about_long = st.text_area("Full Content", "The Digital Landlord Trap...", height=200)
+        st.subheader("About")
+        about_h_in = st.text_input("About Title", key="about_h")
+        about_img = st.text_input("About Image", "https://images.unsplash.com/photo-1543286386-713df548e9cc?q=80&w=1600")
+        about_short_in = st.text_area("Short Summary", key="about_short", height=100)
+        about_long = st.text_area("Full Content", "The Digital Landlord Trap...", height=200)
+    content_tab()
 
 with tabs[2]:
-    st.subheader("📣 Marketing Suite")
-    top_bar_enabled = st.checkbox("Enable Top Bar")
-    top_bar_text = st.text_input("Promo Text", "🔥 50% OFF Launch Sale - Ends Soon!")
-    top_bar_link = st.text_input("Promo Link", "#pricing")
+    @editor_panel(*PREVIEW_PAGES)
+    def marketing_tab():
+        global top_bar_enabled, top_bar_text, top_bar_link, popup_enabled, popup_delay, popup_title, popup_text, popup_cta
+        st.subheader("📣 Marketing Suite")
+        top_bar_enabled = st.checkbox("Enable Top Bar")
+        top_bar_text = st.text_input("Promo Text", "🔥 50% OFF Launch Sale - Ends Soon!")
+        top_bar_link = st.text_input("Promo Link", "#pricing")
     
-    st.divider()
-    popup_enabled = st.checkbox("Enable Popup")
-    popup_delay = st.slider("Delay (seconds)", 1, 30, 5)
-    popup_title = st.text_input("Popup Headline", "Wait! Don't leave empty handed.")
-    popup_text = st.text_input("Popup Body", "Get our free pricing guide on WhatsApp.")
-    popup_cta = st.text_input("Popup Button", "Get it Now")
+        st.divider()
+        popup_enabled = st.checkbox("Enable Popup")
+        popup_delay = st.slider("Delay (seconds)", 1, 30, 5)
+        popup_title = st.text_input("Popup Headline", "Wait! Don't leave empty handed.")
+        popup_text = st.text_input("Popup Body", "Get our free pricing guide on WhatsApp.")
+        popup_cta = st.text_input("Popup Button", "Get it Now")
+    marketing_tab()
 
 with tabs[3]:
-    st.subheader("💰 Pricing")
-    col_p1, col_p2, col_p3 = st.columns(3)
-    titan_price = col_p1.text_input("Setup Price", "$199")
-    titan_mo = col_p1.text_input("Monthly Fee", "$0")
-    wix_name = col_p2.text_input("Competitor", "Wix")
-    wix_mo = col_p2.text_input("Comp. Monthly", "$29/mo")
-    save_val = col_p3.text_input("Savings", "$1,466")
+    @editor_panel("Home")
+    def pricing_tab():
+        global titan_price, titan_mo, wix_name, wix_mo, save_val
+        st.subheader("💰 Pricing")
+        col_p1, col_p2, col_p3 = st.columns(3)
+        titan_price = col_p1.text_input("Setup Price", "$199")
+        titan_mo = col_p1.text_input("Monthly Fee", "$0")
+        wix_name = col_p2.text_input("Competitor", "Wix")
+        wix_mo = col_p2.text_input("Comp. Monthly", "$29/mo")
+        save_val = col_p3.text_input("Savings", "$1,466")
+    pricing_tab()
 
 with tabs[4]:
-    st.subheader("🛒 Store & Payments")
-    st.info("💡 **2050 AR Protocol:** In your Store CSV, make Column F (the 6th column) a link to a `.glb` 3D model to enable native Augmented Reality.")
-    sheet_url = st.text_input("Store CSV", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv")
-    custom_feat = st.text_input("Default Product Img", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=800")
-    col_pay1, col_pay2 = st.columns(2)
-    paypal_link = col_pay1.text_input("PayPal Link", "https://paypal.me/yourid")
-    upi_id = col_pay2.text_input("UPI ID", "name@upi")
+    @editor_panel("Home", "Product Detail (Demo)")
+    def store_tab():
+        global sheet_url, prebuild_catalog, custom_feat, paypal_link, upi_id
+        st.subheader("🛒 Store & Payments")
+        st.info("💡 **2050 AR Protocol:** In your Store CSV, make Column F (the 6th column) a link to a `.glb` 3D model to enable native Augmented Reality.")
+        st.caption("Optional columns: G = Category, H = Stock (0 / no / sold out marks an item unavailable). Both drive the store filters. Uploaded image names in column D are bundled only when the catalog is snapshotted at build time.")
+        sheet_url = st.text_input("Store CSV", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv")
+        prebuild_catalog = st.checkbox("Snapshot catalog at build time", value=False, help="Loads the Store CSV while compiling and ships catalog.json with precomputed filter and sort indexes. Sheet edits then need a rebuild to go live.")
+        custom_feat = st.text_input("Default Product Img", "https://images.unsplash.com/photo-1460925895917-afdab827c52f?q=80&w=800")
+        col_pay1, col_pay2 = st.columns(2)
+        paypal_link = col_pay1.text_input("PayPal Link", "https://paypal.me/yourid")
+        upi_id = col_pay2.text_input("UPI ID", "name@upi")
+    store_tab()
 
 with tabs[5]:
-    st.subheader("📅 Booking Engine")
-    booking_embed = st.text_area("Embed Code", height=150, value='<!-- Calendly inline widget begin -->\n<div class="calendly-inline-widget" data-url="https://calendly.com/titan-demo/30min" style="min-width:320px;height:630px;"></div>\n<script type="text/javascript" src="https://assets.calendly.com/assets/external/widget.js" async></script>\n<!-- Calendly inline widget end -->')
-    booking_title = st.text_input("Booking Title", "Book an Appointment")
-    booking_desc = st.text_input("Booking Subtext", "Select a time slot.")
+    @editor_panel("Booking Page")
+    def booking_tab():
+        global booking_embed, booking_title, booking_desc
+        st.subheader("📅 Booking Engine")
+        booking_embed = st.text_area("Embed Code", height=150, value='<!-- Calendly inline widget begin -->\n<div class="calendly-inline-widget" data-url="https://calendly.com/titan-demo/30min" style="min-width:320px;height:630px;"></div>\n<script type="text/javascript" src="https://assets.calendly.com/assets/external/widget.js" async></script>\n<!-- Calendly inline widget end -->')
+        booking_title = st.text_input("Booking Title", "Book an Appointment")
+        booking_desc = st.text_input("Booking Subtext", "Select a time slot.")
+    booking_tab()
 
 with tabs[6]:
-    st.subheader("📰 Blog")
-    blog_sheet_url = st.text_input("Blog CSV", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv")
-    blog_hero_title = st.text_input("Blog Title", "Latest Insights")
-    blog_hero_sub = st.text_input("Blog Subtext", "Thoughts on tech.")
+    @editor_panel("Blog Index", "Blog Post (Demo)")
+    def blog_tab():
+        global blog_sheet_url, blog_hero_title, blog_hero_sub
+        st.subheader("📰 Blog")
+        blog_sheet_url = st.text_input("Blog CSV", placeholder="https://docs.google.com/spreadsheets/d/e/.../pub?output=csv")
+        blog_hero_title = st.text_input("Blog Title", "Latest Insights")
+        blog_hero_sub = st.text_input("Blog Subtext", "Thoughts on tech.")
+    blog_tab()
 
 with tabs[7]:
-    st.subheader("Legal")
-    testi_data = st.text_area("Testimonials", "Rajesh Gupta | Titan stopped the bleeding.\nSarah Jenkins | Easy updates.", height=100)
-    faq_data = st.text_area("FAQ", "Do I pay $0? ? Yes.\nIs it secure? ? Yes.", height=100)
-    priv_txt = st.text_area("Privacy", "We collect minimum data.", height=100)
-    term_txt = st.text_area("Terms", "You own the code.", height=100)
+    @editor_panel("Home", "Privacy", "Terms")
+    def legal_tab():
+        global testi_data, faq_data, priv_txt, term_txt
+        st.subheader("Legal")
+        testi_data = st.text_area("Testimonials", "Rajesh Gupta | Titan stopped the bleeding.\nSarah Jenkins | Easy updates.", height=100)
+        faq_data = st.text_area("FAQ", "Do I pay $0? ? Yes.\nIs it secure? ? Yes.", height=100)
+        priv_txt = st.text_area("Privacy", "We collect minimum data.", height=100)
+        term_txt = st.text_area("Terms", "You own the code.", height=100)
+    legal_tab()
 
 with tabs[8]:
-    st.subheader("🪐 InterPlanetary File System (IPFS) Deployment")
-    st.markdown("Host your site on the decentralized Web3 network. It can never be taken down, and costs $0/month.")
-    pinata_jwt = st.text_input("Pinata API JWT (Leave blank for standard ZIP download)", type="password")
+    @editor_panel()
+    def ipfs_tab():
+        global pinata_jwt
+        st.subheader("🪐 InterPlanetary File System (IPFS) Deployment")
+        st.markdown("Host your site on the decentralized Web3 network. It can never be taken down, and costs $0/month.")
+        pinata_jwt = st.text_input("Pinata API JWT (Leave blank for standard ZIP download)", type="password")
+    ipfs_tab()
 
 
 # --- 5. COMPILER ENGINE (READABLE & COMPLETE) ---
 
-def format_text(text):
-    if not text: return ""
-    processed_text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-    lines = processed_text.split('\n')
-    html_out = ""
-    in_list = False
-    for line in lines:
-        clean_line = line.strip()
-        if not clean_line: continue
-        if clean_line.startswith("* "):
-            if not in_list: 
-                html_out += '<ul style="margin-bottom:1rem; padding-left:1.5rem;">'
-                in_list = True
-            html_out += f'<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">{clean_line[2:]}</li>'
-        else:
-            if in_list: 
-                html_out += "</ul>"
-                in_list = False
-            html_out += f"<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>{clean_line}</p>"
-    if in_list: html_out += "</ul>"
-    return html_out
-
-def gen_schema():
-    schema = {
+# Local images are swapped for the bundled variants from image_pipeline; remote URLs pass through untouched.
+def img_url(ref, width=960):
+    a = img_assets.get(ref)
+    return pick_variant(a, width) if a else ref
+
+def og_url(ref):
+    a = img_assets.get(ref)
+    return f"{prod_url.rstrip('/')}/{a['og']}" if a else ref
+
+def img_html(ref, alt, sizes="100vw", attrs="", style=""):
+    a = img_assets.get(ref)
+    if not a: return f'<img src="{ref}" alt="{alt}" {attrs} style="{style}">'
+    # Opaque images get a blurred preview behind them; transparent ones (logos) would show it through.
+    bg = "" if a["alpha"] else f" background:url({a['placeholder']}) center/cover no-repeat;"
+    img = f'<img src="{pick_variant(a, 960)}" srcset="{srcset(a)}" sizes="{sizes}" width="{a["w"]}" height="{a["h"]}" alt="{alt}" {attrs} style="{style}{bg}">'
+    return f'<picture><source type="image/avif" srcset="{srcset(a, "avif")}" sizes="{sizes}">{img}</picture>' if "avif" in a["variants"] else img
+
+def preview_html(html):
+    # The preview iframe cannot reach img/, the base stylesheet or the icon sprite, so they are inlined (one image variant each, no srcset).
+    html = html.replace(f'<link rel="stylesheet" href="{BASE_CSS_HREF}">', f"<style>{BASE_CSS}</style>", 1)
+    if ICON_SPRITE_HREF in html: html = html.replace(f"{ICON_SPRITE_HREF}#", "#").replace("<body>", f'<body><div hidden>{ICON_SPRITE}</div>', 1)
+    if not img_assets: return html
+    owners = {path: a for a in img_assets.values() for path in a["files"]}
+    html = re.sub(r'<source type="image/avif" srcset="img/[^"]*"[^>]*>|\s(?:srcset|sizes)="(?:img/[^"]*|[^"]*vw|\d+px)"', "", html)
+    return re.sub(r'img/[\w.-]+\.(?:webp|avif|png|jpg)', lambda m: data_uri(owners[m.group(0)], m.group(0)) if m.group(0) in owners else m.group(0), html)
+
+def get_schema_data():
+    return {
         "@context": "https://schema.org", 
         "@type": "LocalBusiness", 
         "name": biz_name, 
-        "image": logo_url or hero_img_1, 
+        "image": og_url(logo_url or hero_img_1), 
         "telephone": biz_phone, 
         "email": biz_email, 
         "url": prod_url, 
         "description": seo_d
     }
-    return f'<script type="application/ld+json">{json.dumps(schema)}</script>'
+
+def gen_schema():
+    return f'<script type="application/ld+json">{json.dumps(get_schema_data())}</script>'
 
 def gen_pwa_manifest():
     return json.dumps({
@@ -306,13 +421,13 @@ def gen_pwa_manifest():
         "background_color": "#ffffff", 
         "theme_color": p_color,
         "description": pwa_desc, 
-        "icons": [{"src": pwa_icon, "sizes": "512x512", "type": "image/png", "purpose": "any maskable"}]
+        "icons": [{"src": icons[192], "sizes": "192x192", "type": "image/png", "purpose": "any"}, {"src": icons[512], "sizes": "512x512", "type": "image/png", "purpose": "any maskable"}] if (icons := img_assets.get(pwa_icon, {}).get("icons")) else [{"src": pwa_icon, "sizes": "512x512", "type": "image/png", "purpose": "any maskable"}]
     })
 
 def gen_sw():
     return """
     const CACHE_NAME = 'titan-v50-cache';
-    const urlsToCache = ['./index.html', './about.html', './contact.html', './product.html', './blog.html', './post.html'];
+    const urlsToCache = ['./index.html', './about.html', './contact.html', './product.html', './blog.html', './post.html', './""" + BASE_CSS_HREF + """', './""" + ICON_SPRITE_HREF + """'];
     
     self.addEventListener('install', (e) => { 
         e.waitUntil(caches.open(CACHE_NAME).then((cache) => cache.addAll(urlsToCache))); 
@@ -333,178 +448,119 @@ def gen_sw():
     """
 
 def get_theme_css():
-    bg_color, text_color, card_bg, glass_nav = "#ffffff", "#0f172a", "#ffffff", "rgba(255, 255, 255, 0.95)"
-    
-    if "Midnight" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#0f172a", "#f8fafc", "#1e293b", "rgba(15, 23, 42, 0.9)"
-    elif "Cyberpunk" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#050505", "#00ff9d", "#111", "rgba(0,0,0,0.8)"
-    elif "Luxury" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#1c1c1c", "#D4AF37", "#2a2a2a", "rgba(28,28,28,0.95)"
-    elif "Forest" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#f1f8e9", "#1b5e20", "#ffffff", "rgba(241,248,233,0.9)"
-    elif "Ocean" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#e0f7fa", "#006064", "#ffffff", "rgba(224,247,250,0.9)"
-    elif "Stark" in theme_mode: 
-        bg_color, text_color, card_bg, glass_nav = "#ffffff", "#000000", "#ffffff", "rgba(255,255,255,1)"
-
-    anim_css = ""
-    if anim_type == "Fade Up":
-        anim_css = ".reveal { opacity: 0; transform: translateY(30px); transition: all 0.8s ease-out; } .reveal.active { opacity: 1; transform: translateY(0); }"
-    elif anim_type == "Zoom In":
-        anim_css = ".reveal { opacity: 0; transform: scale(0.95); transition: all 0.8s cubic-bezier(0.175, 0.885, 0.32, 1.275); } .reveal.active { opacity: 1; transform: scale(1); }"
-    
-    hero_align = "text-align: center; justify-content: center;"
-    if hero_layout == "Left":
-        hero_align = "text-align: left; justify-content: flex-start; align-items: center;"
-
-    card_hover_css = "box-shadow: 0 20px 40px -10px rgba(0,0,0,0.15); transform: translateY(-5px);"
-    if card_hover_style == "Primary Color Border": 
-        card_hover_css += f" border-color: var(--p);"
-    elif card_hover_style == "Accent Color Border (Red)": 
-        card_hover_css += f" border-color: var(--s);"
-    else: 
-        card_hover_css += f" border-color: transparent;"
+    # Only the tokens change per build; BASE_CSS is linked separately and never changes.
+    brand = {"p": p_color, "s": s_color, "btn-txt": btn_txt_color, "radius": border_rad, "h-font": f"'{h_font}', sans-serif", "b-font": f"'{b_font}', sans-serif",
+             "overlay": overlay_opacity, "card-hover-border": CARD_HOVER_BORDER[card_hover_style], **HERO_ALIGN[hero_layout]}
+    return theme_tokens_css(theme_mode, tuple(brand.items()), enable_theme_switch)
+
+AB_COPY_FIELDS = {2: "hero-title", 3: "hero-sub"}
+
+def get_ab_variants():
+    # "Name | Accent | Headline | Subtext" per line; A is reserved for the original.
+    variants = []
+    for line in ab_variants.split('\n'):
+        p = [x.strip() for x in line.split('|')] + [''] * 3
+        if re.fullmatch(r'[\w-]+', p[0]) and p[0] != 'A' and p[0] not in [v[0] for v in variants]: variants.append(p[:4])
+    return variants
+
+def gen_ab_css():
+    if not enable_ab: return ""
+    css = [".ab-copy { display: none; }"]
+    for name, accent, *copy in get_ab_variants():
+        if accent: css.append(f"html.ab-{name} {{ --s: {accent}; }}")
+        for idx, text in enumerate(copy, 2):
+            if text: css.append(f"html.ab-{name} #{AB_COPY_FIELDS[idx]} > .ab-base {{ display: none; }} html.ab-{name} .ab-copy-{name} {{ display: inline; }}")
+    return " ".join(css)
+
+def ab_copy(text, idx):
+    # Every variant's copy is rendered up front; the html.ab-* class set before first paint picks the visible one.
+    alts = [(v[0], v[idx]) for v in get_ab_variants() if v[idx]] if enable_ab else []
+    if not alts: return text
+    return f'<span class="ab-base">{text}</span>' + "".join(f'<span class="ab-copy ab-copy-{name}">{alt}</span>' for name, alt in alts)
+
+def gen_prepaint_script():
+    # Runs synchronously in <head> so the variant and colour scheme are applied before the first paint.
+    js = []
+    if enable_ab:
+        names = json.dumps(['A'] + [v[0] for v in get_ab_variants()])
+        js.append(f"var v={names},k='titan_ab',x=null;try{{x=localStorage.getItem(k)}}catch(e){{}}if(v.indexOf(x)<0){{x=v[Math.floor(Math.random()*v.length)];try{{localStorage.setItem(k,x)}}catch(e){{}}}}d.classList.add('ab-'+x);d.dataset.ab=x;")
+    if enable_theme_switch:
+        js.append(f"var t=null;try{{t=localStorage.getItem('{THEME_STORAGE_KEY}')}}catch(e){{}}if({json.dumps(THEME_SLUGS)}.indexOf(t)>=0)d.dataset.theme=t;else t=null;")
+    if enable_context:
+        # A theme the visitor picked by hand beats the time-of-day guess.
+        js.append(f"var h=new Date().getHours();if({'!t&&' if enable_theme_switch else ''}(h>=19||h<=6||matchMedia('(prefers-color-scheme: dark)').matches))d.classList.add('dark-mode');")
+    return f"<script>(function(){{var d=document.documentElement;{''.join(js)}}})();</script>" if js else ""
+
+def gen_rum_script():
+    if not rum_endpoint: return ""
+    endpoint = json.dumps(rum_endpoint).replace("</", "<\\/")
+    # LCP/CLS/INP/TTFB plus titanRum() marks are batched per page view and sent once the page is hidden.
+    # CLS and INP keep their page-wide maximum outside q, which is emptied on every flush.
+    return f"""<script>
+    (function() {{
+        var ep = {endpoint}, q = {{}}, vid = Date.now().toString(36) + Math.random().toString(36).slice(2, 8), cls = 0, inp = 0, sv = 0, sf = 0, sl = 0;
+        window.titanRum = function(name, value) {{ q[name] = Math.round(value); }};
+        function obs(type, cb, opts) {{ try {{ new PerformanceObserver(function(l) {{ l.getEntries().forEach(cb); }}).observe(Object.assign({{ type: type, buffered: true }}, opts || {{}})); }} catch(e) {{}} }}
+        obs('largest-contentful-paint', function(e) {{ q.lcp = Math.round(e.startTime); }});
+        obs('layout-shift', function(e) {{ if (e.hadRecentInput) return; if (sv && (e.startTime - sl > 1000 || e.startTime - sf > 5000)) sv = 0; if (!sv) sf = e.startTime; sv += e.value; sl = e.startTime; if (sv > cls) {{ cls = sv; q.cls = Math.round(cls * 1000) / 1000; }} }});
+        obs('event', function(e) {{ if (e.interactionId && e.duration > inp) {{ inp = e.duration; q.inp = inp; }} }}, {{ durationThreshold: 40 }});
+        var nav = performance.getEntriesByType('navigation')[0]; if (nav) q.ttfb = Math.round(nav.responseStart);
+        function flush() {{
+            if (!Object.keys(q).length) return;
+            var body = JSON.stringify({{ v: vid, site: location.host || 'local', page: location.pathname.split('/').pop() || 'index.html', variant: document.documentElement.dataset.ab || null, m: q }}); q = {{}};
+            if (!(navigator.sendBeacon && navigator.sendBeacon(ep, body))) fetch(ep, {{ method: 'POST', body: body, keepalive: true }}).catch(function() {{}});
+        }}
+        document.addEventListener('visibilitychange', function() {{ if (document.visibilityState === 'hidden') flush(); }});
+        window.addEventListener('pagehide', flush);
+    }})();
+    </script>"""
 
-    return f"""
-    :root {{
-        --p: {p_color}; --s: {s_color}; --btn-txt: {btn_txt_color};
-        --bg: {bg_color}; --txt: {text_color}; --card: {card_bg};
-        --radius: {border_rad}; --nav: {glass_nav};
-        --h-font: '{h_font}', sans-serif; --b-font: '{b_font}', sans-serif;
-    }}
-    * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-    html {{ scroll-behavior: smooth; font-size: 16px; }}
-    body {{ background-color: var(--bg); color: var(--txt); font-family: var(--b-font); line-height: 1.6; overflow-x: hidden; transition: background 0.3s, color 0.3s; }}
-    
-    body.dark-mode {{ --bg: #0f172a; --txt: #f8fafc; --card: #1e293b; --nav: rgba(15, 23, 42, 0.95); }}
-    
-    p, h1, h2, h3, h4, h5, h6, span, li, div {{ color: inherit; }}
-    h1, h2, h3, h4 {{ font-family: var(--h-font); color: var(--p); line-height: 1.2; margin-bottom: 1rem; }}
-    strong {{ color: var(--p); font-weight: 800; }}
-    h1 {{ font-size: clamp(2.5rem, 5vw, 4.5rem); }}
-    h2 {{ font-size: clamp(2rem, 4vw, 3rem); }}
-    p {{ margin-bottom: 1rem; }}
-    
-    .hero {{ position: relative; min-height: 90vh; overflow: hidden; display: flex; {hero_align} color: white; padding-top: 180px; background-color: var(--p); }}
-    .carousel-slide {{ position: absolute; top: 0; left: 0; width: 100%; height: 100%; background-size: cover; background-position: center; opacity: 0; transition: opacity 1.5s ease-in-out; z-index: 0; }}
-    .carousel-slide.active {{ opacity: 1; }}
-    .hero-overlay {{ background: rgba(0,0,0,{overlay_opacity}); position: absolute; top: 0; left: 0; width: 100%; height: 100%; z-index: 1; }}
-    .hero-content {{ z-index: 2; position: relative; width: 100%; padding: 0 20px; }}
-    .hero h1 {{ color: #ffffff !important; text-shadow: 0 4px 20px rgba(0,0,0,0.4); }}
-    .hero p {{ color: rgba(255,255,255,0.95) !important; font-size: clamp(1.1rem, 2vw, 1.3rem); max-width: 700px; margin: 0 auto 2rem auto; text-shadow: 0 2px 10px rgba(0,0,0,0.4); }}
-    
-    input, textarea, select {{ width: 100%; padding: 0.8rem; margin-bottom: 1rem; border: 1px solid #ccc; border-radius: 6px; font-family: inherit; }}
-    label {{ color: var(--txt); font-weight: bold; margin-bottom: 0.5rem; display: block; }}
-    .container {{ max-width: 1280px; margin: 0 auto; padding: 0 20px; }}
-    
-    .btn {{ 
-        display: inline-flex; align-items: center; justify-content: center;
-        padding: 1rem 2rem; border-radius: var(--radius); 
-        font-weight: 700; text-decoration: none; transition: 0.3s; 
-        text-transform: uppercase; cursor: pointer; border: none; text-align: center;
-        line-height: 1.4; min-height: 3.5rem; word-wrap: break-word;
-    }}
-    .btn-primary {{ background: var(--p); color: var(--btn-txt) !important; }}
-    .btn-accent {{ background: var(--s); color: var(--btn-txt) !important; box-shadow: 0 10px 25px -5px var(--s); }}
-    .btn:hover {{ transform: translateY(-3px); filter: brightness(1.15); }}
-    
-    nav#main-navbar {{ position: fixed; top: 0; width: 100%; z-index: 1000; background: var(--nav); backdrop-filter: blur(12px); border-bottom: 1px solid rgba(100,100,100,0.1); padding: 1rem 0; transition: top 0.3s; }}
-    .nav-flex {{ display: flex; justify-content: space-between; align-items: center; }}
-    .nav-links {{ display: flex; align-items: center; gap: 1.5rem; }}
-    .nav-links a {{ text-decoration: none; font-weight: 600; color: var(--txt); font-size: 0.9rem; transition:0.2s; }}
-    .nav-links a:hover {{ color: var(--s); }}
-    .mobile-menu {{ display: none; font-size: 1.5rem; cursor: pointer; }}
-    
-    main section {{ padding: clamp(2rem, 4vw, 4rem) 0; }}
-    .section-head {{ text-align: center; margin-bottom: clamp(1rem, 3vw, 2.5rem); }}
-    .grid-3 {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; }}
-    .about-grid, .detail-view {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4rem; align-items: center; }}
-    .contact-grid {{ display: grid; grid-template-columns: 1fr 2fr; gap: 3rem; }}
-    
-    .card {{ background: var(--card); border-radius: var(--radius); border: 1px solid rgba(100,100,100,0.1); transition: 0.3s; display: flex; flex-direction: column; overflow: hidden; }}
-    .card:hover {{ {card_hover_css} }}
-    
-    .card h3, .card h4, .card a:not(.btn) {{ color: var(--txt) !important; text-decoration: none; }}
-    
-    .card-body {{ padding: 1.5rem; display: flex; flex-direction: column; flex-grow: 1; }}
-    .card-desc {{ font-size: 0.9rem; opacity: 0.8; margin-bottom: 1.5rem; display: -webkit-box; -webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden; }}
-    .prod-img {{ width: 100%; height: 250px; object-fit: cover; background: #f1f5f9; }}
-    
-    .gallery-thumbs {{ display: flex; gap: 10px; margin-top: 15px; overflow-x: auto; }}
-    .thumb {{ width: 60px; height: 60px; border-radius: 8px; object-fit: cover; cursor: pointer; border: 2px solid transparent; opacity: 0.7; transition: 0.2s; }}
-    .thumb:hover, .thumb.active {{ border-color: var(--s); opacity: 1; }}
-
-    .pricing-wrapper {{ overflow-x: auto; -webkit-overflow-scrolling: touch; width: 100%; margin: 0 auto; }}
-    .pricing-table {{ width: 100%; border-collapse: collapse; min-width: 100%; }}
-    .pricing-table th {{ background: var(--p); color: white; padding: 1.5rem 1rem; text-align: left; }}
-    .pricing-table td {{ padding: 1.5rem 1rem; border-bottom: 1px solid rgba(100,100,100,0.1); background: var(--card); color: var(--txt); }}
-
-    details {{ background: var(--card); border: 1px solid rgba(100,100,100,0.1); border-radius: 8px; margin-bottom: 1rem; padding: 1rem; cursor: pointer; color: var(--txt); }}
-    details summary {{ font-weight: bold; font-size: 1.1rem; color: var(--txt); }}
-
-    footer {{ background: var(--p); color: white; padding: 4rem 0; margin-top: auto; }}
-    .footer-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 3rem; }}
-    footer a {{ color: rgba(255,255,255,0.8) !important; text-decoration: none; display: block; margin-bottom: 0.5rem; transition: 0.3s; }}
-    footer a:hover {{ color: #ffffff !important; text-decoration: underline; }}
-    .social-icon {{ width: 24px; height: 24px; fill: rgba(255,255,255,0.7); transition: 0.3s; }}
-    .social-icon:hover {{ fill: #ffffff; transform: scale(1.1); }}
-
-    .blog-badge {{ background: var(--s); color: var(--btn-txt); padding: 0.3rem 0.8rem; border-radius: 50px; font-size: 0.75rem; text-transform: uppercase; font-weight: bold; width: fit-content; margin-bottom: 1rem; display:inline-block; }}
-    
-    #cart-float {{ position: fixed; bottom: 100px; right: 30px; background: var(--p); color: var(--btn-txt); padding: 15px 20px; border-radius: 50px; box-shadow: 0 10px 20px rgba(0,0,0,0.2); cursor: pointer; z-index: 998; display: flex; align-items: center; gap: 10px; font-weight: bold; }}
-    #cart-modal {{ display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); width: 90%; max-width: 500px; padding: 2rem; border-radius: 16px; box-shadow: 0 20px 50px rgba(0,0,0,0.3); z-index: 1001; border: 1px solid rgba(128,128,128,0.2); color: var(--txt); }}
-    #cart-overlay, #lang-overlay {{ display: none; position: fixed; inset: 0; background: rgba(0,0,0,0.5); z-index: 1000; }}
-    .cart-item {{ display: flex; justify-content: space-between; border-bottom: 1px solid #eee; padding: 10px 0; }}
-    
-    .local-vault {{ background: rgba(128,128,128,0.05); padding: 1rem; border-radius: 8px; margin-top: 1rem; border: 1px solid rgba(128,128,128,0.1); }}
-    .local-vault input {{ width: 100%; padding: 0.8rem; margin-top: 0.5rem; border-radius: 6px; border: 1px solid #ccc; background: var(--bg); color: var(--txt); }}
-    
-    #voice-btn {{ position: fixed; bottom: 170px; right: 30px; background: var(--p); color: var(--btn-txt); border-radius: 50px; width: 50px; height: 50px; display: flex; align-items: center; justify-content: center; font-size: 1.2rem; cursor: pointer; box-shadow: 0 10px 20px rgba(0,0,0,0.2); z-index: 998; border: none; }}
-    .listening {{ animation: pulse 1s infinite; background: var(--s) !important; }}
-    @keyframes pulse {{ 0% {{ transform: scale(1); }} 50% {{ transform: scale(1.1); }} 100% {{ transform: scale(1); }} }}
-    model-viewer {{ width: 100%; height: 400px; background-color: transparent; border-radius: 12px; }}
-
-    #lang-modal {{ display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); width: 90%; max-width: 400px; padding: 2rem; border-radius: 12px; z-index: 1002; color: var(--txt); text-align: center; }}
-    .lang-opt {{ display: block; width: 100%; padding: 1rem; border: 1px solid #eee; margin-bottom: 0.5rem; border-radius: 8px; cursor: pointer; font-weight: bold; text-decoration: none; color: var(--txt); }}
-    .lang-opt:hover {{ background: var(--s); color: white; }}
-    
-    .share-row {{ display: flex; gap: 10px; margin-top: 20px; flex-wrap: wrap; }}
-    .share-btn {{ width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; border-radius: 50%; color: white; transition: 0.3s; cursor: pointer; border: none; text-decoration: none; }}
-    .share-btn svg {{ width: 20px; height: 20px; fill: white; }}
-    .bg-fb {{ background: #1877F2; }} .bg-x {{ background: #000000; }} .bg-li {{ background: #0A66C2; }} .bg-wa {{ background: #25D366; }} .bg-rd {{ background: #FF4500; }} .bg-link {{ background: #64748b; }}
-    
-    #top-bar {{ position: fixed; top: 0; width: 100%; background: var(--s); color: var(--btn-txt); text-align: center; padding: 10px; z-index: 1002; font-weight: bold; font-size: 0.9rem; transition: transform 0.3s; }}
-    #top-bar a {{ color: var(--btn-txt); text-decoration: underline; }}
-    
-    #lead-popup {{ display: none; position: fixed; top: 50%; left: 50%; transform: translate(-50%, -50%); background: var(--card); padding: 3rem; text-align: center; border-radius: var(--radius); z-index: 2000; box-shadow: 0 25px 100px rgba(0,0,0,0.5); width: 90%; max-width: 450px; border: 1px solid rgba(0,0,0,0.1); color: var(--txt); }}
-    .close-popup {{ position: absolute; top: 15px; right: 15px; cursor: pointer; font-size: 1.5rem; opacity: 0.5; }}
-    
-    #theme-toggle {{ position: fixed; bottom: 30px; left: 30px; width: 40px; height: 40px; background: var(--card); border-radius: 50%; display: flex; align-items: center; justify-content: center; box-shadow: 0 5px 15px rgba(0,0,0,0.1); cursor: pointer; z-index: 999; font-size: 1.2rem; border: 1px solid rgba(0,0,0,0.1); }}
-    
-    {anim_css}
-    @media (max-width: 768px) {{
-        nav#main-navbar .nav-links {{ position: fixed; top: 60px; left: -100%; width: 100%; height: calc(100vh - 60px); background: var(--bg); flex-direction: column; padding: 2rem; transition: 0.3s; align-items: flex-start; gap: 1.5rem; overflow-y: auto; }}
-        nav#main-navbar .nav-links.active {{ left: 0; }}
-        .mobile-menu {{ display: block; }}
-        .about-grid, .contact-grid, .detail-view, .grid-3 {{ grid-template-columns: 1fr !important; }}
-    }}
-    /* 👉 ADD THIS NEW LINE HERE: */
-        .pricing-table th, .pricing-table td {{ padding: 1rem 0.5rem; font-size: 0.85rem; }}
-    }}
-    """
+def rum_mark(name):
+    return f"if(window.titanRum) titanRum('{name}', performance.now() - t0);" if rum_endpoint else ""
 
 def gen_2050_scripts():
-    context_js = "if(new Date().getHours() >= 19 || new Date().getHours() <= 6) document.body.classList.add('dark-mode');" if enable_context else ""
-    ab_js = "let variant = localStorage.getItem('titan_ab') || (Math.random() > 0.5 ? 'A' : 'B'); localStorage.setItem('titan_ab', variant); if(variant === 'B') document.documentElement.style.setProperty('--s', '#10b981');" if enable_ab else ""
-    voice_js = "function startVoiceSearch() { if (!('webkitSpeechRecognition' in window)) return alert('Voice search not supported in this browser.'); const rec = new webkitSpeechRecognition(); rec.lang = 'en-US'; const btn = document.getElementById('voice-btn'); btn.classList.add('listening'); rec.onresult = (e) => { const transcript = e.results[0][0].transcript.toLowerCase(); alert('Searching for: ' + transcript); document.querySelectorAll('.card').forEach(c => { c.style.display = c.innerText.toLowerCase().includes(transcript) ? 'flex' : 'none'; }); }; rec.onend = () => btn.classList.remove('listening'); rec.start(); }" if enable_voice else ""
-    return f"<script defer>{context_js} {ab_js} {voice_js}</script>"
+    voice_js = "function startVoiceSearch() { if (!('webkitSpeechRecognition' in window)) return alert('Voice search not supported in this browser.'); const rec = new webkitSpeechRecognition(); rec.lang = 'en-US'; const btn = document.getElementById('voice-btn'); btn.classList.add('listening'); rec.onresult = (e) => { const transcript = e.results[0][0].transcript.toLowerCase().trim(); alert('Searching for: ' + transcript); catQuery = transcript; if (CAT) applyFilters(); }; rec.onend = () => btn.classList.remove('listening'); rec.start(); }" if enable_voice else ""
+    return f"<script defer>{voice_js}</script>" if voice_js else ""
+
+def gen_prefetch_script():
+    # Intent-based: a link is prefetched after a short hover or on touchstart, up to prefetch_budget pages per page view.
+    # Links with data-warm="kind:index" also hand their row to the next page through sessionStorage (see titanWarmers).
+    if not enable_prefetch: return ""
+    return f"""<script>
+    (function() {{
+        var c = navigator.connection; if (c && (c.saveData || /2g/.test(c.effectiveType))) return;
+        var left = {prefetch_budget}, seen = new Set([location.href.split('#')[0]]), timer = null;
+        var rules = window.HTMLScriptElement && HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules');
+        function warm(a) {{
+            var w = a.dataset.warm, get; if (!w) return; w = w.split(':'); get = (window.titanWarmers || {{}})[w[0]];
+            if (get) try {{ sessionStorage.setItem('titan-warm-' + w[0], JSON.stringify(get(w[1]))); }} catch(e) {{}}
+        }}
+        function prefetch(a) {{
+            warm(a);
+            var url = a.href.split('#')[0]; if (seen.has(url) || left <= 0) return;
+            seen.add(url); left--;
+            var el = document.createElement(rules ? 'script' : 'link');
+            if (rules) {{ el.type = 'speculationrules'; el.textContent = JSON.stringify({{ prefetch: [{{ source: 'list', urls: [url] }}] }}); }}
+            else {{ el.rel = 'prefetch'; el.href = url; }}
+            document.head.appendChild(el);
+        }}
+        function link(e) {{
+            var a = e.target.closest && e.target.closest('a[href]');
+            return a && a.origin === location.origin && /\\.html$/.test(a.pathname) && !a.target && !a.hasAttribute('download') ? a : null;
+        }}
+        document.addEventListener('pointerover', function(e) {{ var a = link(e); if (a) {{ clearTimeout(timer); timer = setTimeout(function() {{ prefetch(a); }}, 65); }} }}, {{ passive: true }});
+        document.addEventListener('pointerout', function() {{ clearTimeout(timer); }}, {{ passive: true }});
+        document.addEventListener('touchstart', function(e) {{ var a = link(e); if (a) prefetch(a); }}, {{ passive: true }});
+        document.addEventListener('focusin', function(e) {{ var a = link(e); if (a) prefetch(a); }});
+    }})();
+    </script>"""
 
 def gen_nav():
-    logo_display = f'<img src="{logo_url}" height="40" width="auto" alt="{biz_name} Logo" loading="eager">' if logo_url else f'<span style="font-weight:900; font-size:1.5rem; color:var(--p)">{biz_name}</span>'
+    logo_display = img_html(logo_url, f"{biz_name} Logo", "160px", 'loading="eager"', "height:40px; width:auto;") if logo_url else f'<span style="font-weight:900; font-size:1.5rem; color:var(--p)">{biz_name}</span>'
     blog_link = '<a href="blog.html" onclick="toggleMenu()">Blog</a>' if show_blog else ''
     book_link = '<a href="booking.html" onclick="toggleMenu()">Book Now</a>' if show_booking else ''
     lang_btn = f'<a href="#" onclick="openLangModal()" aria-label="Switch Language">🌐 ES</a>' if lang_sheet else ''
+    theme_toggle = '<div id="theme-toggle" onclick="titanTheme()" aria-label="Switch Theme">🌓</div>' if enable_theme_switch else '<div id="theme-toggle" onclick="document.documentElement.classList.toggle(\'dark-mode\')" aria-label="Toggle Dark Mode">🌓</div>'
     
     return f"""
     {f'<div id="top-bar"><a href="{top_bar_link}">{top_bar_text}</a></div>' if top_bar_enabled else ''}
@@ -525,33 +581,60 @@ def gen_nav():
             </div>
         </div>
     </nav>
-    <div id="theme-toggle" onclick="document.body.classList.toggle('dark-mode')" aria-label="Toggle Dark Mode">🌓</div>
+    {theme_toggle}
     <script>
+        {theme_switch_script() if enable_theme_switch else ''}
         function toggleMenu() {{ document.querySelector('.nav-links').classList.remove('active'); }}
         if({str(top_bar_enabled).lower()}) {{ document.querySelector('#main-navbar').style.top = '40px'; }}
     </script>
     """
 
 def gen_hero():
-    bg_media = f"""
-    <div class="carousel-slide active" style="background-image: url('{hero_img_1}')"></div>
-    <div class="carousel-slide" style="background-image: url('{hero_img_2}')"></div>
-    <div class="carousel-slide" style="background-image: url('{hero_img_3}')"></div>
+    # Only the first slide is painted up front; the next one is fetched while the current one is showing.
+    # The rotation timer runs only while the hero is on screen and the tab is visible.
+    slides = [img_url(img, 1920) for img in (hero_img_1, hero_img_2, hero_img_3) if img]
+    bg_media = "".join(f'<div class="carousel-slide active" style="background-image: url(\'{img}\')"></div>' if i == 0 else f'<div class="carousel-slide" data-bg="{img}"></div>' for i, img in enumerate(slides))
+    bg_media += """
     <script defer>
-        let slides = document.querySelectorAll('.carousel-slide'); let currentSlide = 0; 
-        setInterval(() => {{ slides[currentSlide].classList.remove('active'); currentSlide = (currentSlide + 1) % slides.length; slides[currentSlide].classList.add('active'); }}, 4000);
+    (function() {
+        const hero = document.currentScript.closest('.hero'); const slides = hero.querySelectorAll('.carousel-slide'); if (slides.length < 2) return;
+        let cur = 0, timer = null, visible = true;
+        const prime = (s) => { if (s.dataset.bg) { s.style.backgroundImage = `url('${s.dataset.bg}')`; delete s.dataset.bg; } };
+        function step() { slides[cur].classList.remove('active'); cur = (cur + 1) % slides.length; prime(slides[cur]); slides[cur].classList.add('active'); prime(slides[(cur + 1) % slides.length]); }
+        function sync() { const run = visible && !document.hidden; if (run && !timer) timer = setInterval(step, 4000); else if (!run && timer) { clearInterval(timer); timer = null; } }
+        if ('IntersectionObserver' in window) new IntersectionObserver((e) => { visible = e[0].isIntersecting; sync(); }).observe(hero);
+        document.addEventListener('visibilitychange', sync);
+        window.addEventListener('load', () => { prime(slides[1]); sync(); });
+    })();
     </script>
     """
     if hero_video_id: 
-        bg_media = f'<iframe src="https://www.youtube.com/embed/{hero_video_id}?autoplay=1&mute=1&loop=1&playlist={hero_video_id}&controls=0&showinfo=0&rel=0" style="position:absolute; top:50%; left:50%; width:100vw; height:100vh; transform:translate(-50%, -50%); pointer-events:none; object-fit:cover; z-index:0; min-width:177.77vh; min-height:56.25vw;" frameborder="0" allow="autoplay; encrypted-media"></iframe>'
+        # Poster facade: the YouTube player is only injected on first interaction or once the page is idle (skipped on Save-Data).
+        bg_media = f"""
+    <div class="carousel-slide active" style="background-image: url('https://i.ytimg.com/vi/{hero_video_id}/hqdefault.jpg')"></div>
+    <script defer>
+    (function() {{
+        const poster = document.currentScript.previousElementSibling; let loaded = false;
+        function loadVideo() {{
+            if (loaded) return; loaded = true;
+            poster.innerHTML = '<iframe src="https://www.youtube.com/embed/{hero_video_id}?autoplay=1&mute=1&loop=1&playlist={hero_video_id}&controls=0&showinfo=0&rel=0" style="position:absolute; top:50%; left:50%; width:100vw; height:100vh; transform:translate(-50%, -50%); pointer-events:none; object-fit:cover; z-index:0; min-width:177.77vh; min-height:56.25vw;" frameborder="0" allow="autoplay; encrypted-media" title="Background video"></iframe>';
+        }}
+        ['pointerdown', 'keydown', 'touchstart', 'scroll'].forEach(ev => window.addEventListener(ev, loadVideo, {{ once: true, passive: true }}));
+        window.addEventListener('load', () => {{
+            if (navigator.connection && navigator.connection.saveData) return;
+            (window.requestIdleCallback || ((cb) => setTimeout(cb, 2000)))(loadVideo, {{ timeout: 5000 }});
+        }});
+    }})();
+    </script>
+    """
     
     return f"""
     <section class="hero">
         <div class="hero-overlay"></div>
         {bg_media}
         <div class="container hero-content">
-            <h1 id="hero-title">{hero_h}</h1>
-            <p id="hero-sub">{hero_sub}</p>
+            <h1 id="hero-title">{ab_copy(hero_h, 2)}</h1>
+            <p id="hero-sub">{ab_copy(hero_sub, 3)}</p>
             <div style="display:flex; gap:1rem; flex-wrap:wrap; {'justify-content:center;' if hero_layout == 'Center' else ''}">
                 <a href="#inventory" class="btn btn-accent">Explore Now</a>
                 <a href="contact.html" class="btn" style="background:rgba(255,255,255,0.2); backdrop-filter:blur(10px); color:white !important;">Contact Us</a>
@@ -560,15 +643,29 @@ def gen_hero():
     </section>
     """
 
+# Every icon lives once in a shared sprite (icons.<hash>.svg); pages reference it with <use>.
+ICON_PATHS = {
+    "bolt": "M11 21h-1l1-7H7.5c-.58 0-.57-.32-.38-.66.19-.34.05-.08.07-.12C8.48 10.94 10.42 7.54 13 3h1l-1 7h3.5c.49 0 .56.33.47.51l-.07.15C12.96 17.55 11 21 11 21z", 
+    "wallet": "M21 18v1c0 1.1-.9 2-2 2H5c-1.11 0-2-.9-2-2V5c0-1.1.89-2 2-2h14c1.1 0 2 .9 2 2v1h-9c-1.11 0-2 .9-2 2v8c0 1.1.89 2 2 2h9zm-9-2h10V8H12v8zm4-2.5c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5z", 
+    "table": "M19 3H5c-1.1 0-2 .9-2 2v14c0 1.1.9 2 2 2h14c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2zM5 19V5h14v14H5zm2-2h10v-2H7v2zm0-4h10v-2H7v2zm0-4h10V7H7v2z", 
+    "shield": "M12 1L3 5v6c0 5.55 3.84 10.74 9 12 5.16-1.26 9-6.45 9-12V5l-9-4zm0 10.99h7c-.53 4.12-3.28 7.79-7 8.94V12H5V6.3l7-3.11v8.8z", 
+    "check": "M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm-2 15l-5-5 1.41-1.41L10 14.17l7.59-7.59L19 8l-9 9z", 
+    "whatsapp": "M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z", 
+    "facebook": "M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z", 
+    "instagram": "M16.98 0a6.9 6.9 0 0 1 5.08 1.98A6.94 6.94 0 0 1 24 7.02v9.96c0 2.08-.68 3.87-1.98 5.13A7.14 7.14 0 0 1 16.94 24H7.06a7.06 7.06 0 0 1-5.03-1.89A6.96 6.96 0 0 1 0 16.94V7.02C0 2.8 2.8 0 7.02 0h9.96zM7.17 2.1c-1.4 0-2.6.48-3.46 1.33c-.85.85-1.33 2.06-1.33 3.46v10.3c0 1.3.47 2.5 1.33 3.36c.86.85 2.06 1.33 3.46 1.33h9.66c1.4 0 2.6-.48 3.46-1.33c.85-.85 1.33-2.06 1.33-3.46V6.89c0-1.4-.47-2.6-1.33-3.46c-.86-.85-2.06-1.33-3.46-1.33H7.17zm11.97 3.33c.77 0 1.4.63 1.4 1.4c0 .77-.63 1.4-1.4 1.4c-.77 0-1.4-.63-1.4-1.4c0-.77.63-1.4 1.4-1.4zM12 5.76c3.39 0 6.14 2.75 6.14 6.14c0 3.39-2.75 6.14-6.14 6.14c-3.39 0-6.14-2.75-6.14-6.14c0-3.39 2.75-6.14 6.14-6.14zm0 2.1c-2.2 0-3.99 1.79-3.99 4.04c0 2.25 1.79 4.04 3.99 4.04c2.2 0 3.99-1.79 3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04z", 
+    "x": "M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z", 
+    "linkedin": "M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z", 
+    "link": "M3.9 12c0-1.71 1.39-3.1 3.1-3.1h4V7H7c-2.76 0-5 2.24-5 5s2.24 5 5 5h4v-1.9H7c-1.71 0-3.1-1.39-3.1-3.1zM8 13h8v-2H8v2zm9-6h-4v1.9h4c1.71 0 3.1 1.39 3.1 3.1s-1.39 3.1-3.1 3.1h-4V17h4c2.76 0 5-2.24 5-5s-2.24-5-5-5z"
+}
+ICON_SPRITE = '<svg xmlns="http://www.w3.org/2000/svg">' + "".join(f'<symbol id="i-{k}" viewBox="0 0 24 24"><path d="{d}"/></symbol>' for k, d in ICON_PATHS.items()) + "</svg>"
+ICON_SPRITE_HREF = f"icons.{hashlib.sha256(ICON_SPRITE.encode()).hexdigest()[:10]}.svg"
+
+def svg_icon(name, attrs=""):
+    return f'<svg viewBox="0 0 24 24" {attrs} aria-hidden="true"><use href="{ICON_SPRITE_HREF}#i-{name}"/></svg>'
+
 def get_simple_icon(name):
-    icon_map = {
-        "bolt": "M11 21h-1l1-7H7.5c-.58 0-.57-.32-.38-.66.19-.34.05-.08.07-.12C8.48 10.94 10.42 7.54 13 3h1l-1 7h3.5c.49 0 .56.33.47.51l-.07.15C12.96 17.55 11 21 11 21z", 
-        "wallet": "M21 18v1c0 1.1-.9 2-2 2H5c-1.11 0-2-.9-2-2V5c0-1.1.89-2 2-2h14c1.1 0 2 .9 2 2v1h-9c-1.11 0-2 .9-2 2v8c0 1.1.89 2 2 2h9zm-9-2h10V8H12v8zm4-2.5c-.83 0-1.5-.67-1.5-1.5s.67-1.5 1.5-1.5 1.5.67 1.5 1.5-.67 1.5-1.5 1.5z", 
-        "table": "M19 3H5c-1.1 0-2 .9-2 2v14c0 1.1.9 2 2 2h14c1.1 0 2-.9 2-2V5c0-1.1-.9-2-2-2zM5 19V5h14v14H5zm2-2h10v-2H7v2zm0-4h10v-2H7v2zm0-4h10V7H7v2z", 
-        "shield": "M12 1L3 5v6c0 5.55 3.84 10.74 9 12 5.16-1.26 9-6.45 9-12V5l-9-4zm0 10.99h7c-.53 4.12-3.28 7.79-7 8.94V12H5V6.3l7-3.11v8.8z"
-    }
-    path = icon_map.get(name.lower().strip(), "M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm-2 15l-5-5 1.41-1.41L10 14.17l7.59-7.59L19 8l-9 9z")
-    return f'<svg viewBox="0 0 24 24" width="32" height="32" fill="currentColor"><path d="{path}"/></svg>'
+    name = name.lower().strip()
+    return svg_icon(name if name in ICON_PATHS else "check", 'width="32" height="32" fill="currentColor"')
 
 def gen_features():
     cards = "".join([f'<div class="card reveal"><div style="color:var(--s); margin-bottom:1rem;">{get_simple_icon(p[0])}</div><h3>{p[1].strip()}</h3><div>{format_text(p[2].strip())}</div></div>' for l in feat_data_input.split('\n') if (p:=l.split('|')) and len(p)>=3])
@@ -608,18 +705,7 @@ def gen_pricing_table():
 def gen_csv_parser():
     return """
     <script defer>
-    function parseCSVLine(str) { 
-        const res = []; let cur = ''; let inQuote = false; 
-        for (let i = 0; i < str.length; i++) { 
-            const c = str[i]; 
-            if (c === '"') { if (inQuote && str[i+1] === '"') { cur += '"'; i++; } else { inQuote = !inQuote; } } 
-            else if (c === ',' && !inQuote) { res.push(cur.trim()); cur = ''; } 
-            else { cur += c; } 
-        } 
-        res.push(cur.trim()); return res; 
-    } 
-    function parseMarkdown(text) { return text ? text.replace(/\\r\\n/g, '\\n').replace(/\\n/g, '<br>').replace(/\\*\\*(.*?)\\*\\*/g, '<strong>$1</strong>') : ''; }
-    </script>
+""" + CSV_LINE_JS + MARKDOWN_JS + """    </script>
     """
 
 def gen_cart_system():
@@ -639,38 +725,85 @@ def gen_cart_system():
         <button onclick="checkoutWhatsApp()" class="btn btn-accent" style="width:100%; margin-top:1rem;">1-Click Checkout via WhatsApp</button>
     </div>
     <script defer>
-    let cart = JSON.parse(localStorage.getItem('titanCart')) || [];
+    // Cart store: one line per product name with a quantity and a unit price parsed once.
+    // Count/total are kept as running sums and only the touched row is re-rendered.
+    const cartLines = new Map(); const cartRows = new Map(); let cartCount = 0, cartTotal = 0, cartSaveTimer = null;
     document.getElementById('vault-name').value = localStorage.getItem('t_name') || ''; document.getElementById('vault-address').value = localStorage.getItem('t_addr') || '';
-    
-    function renderCart() {{
-        const box = document.getElementById('cart-items'); if(!box) return; box.innerHTML = ''; let total = 0;
-        cart.forEach((item, i) => {{ 
-            total += parseFloat(item.price.replace(/[^0-9.]/g, '')) || 0; 
-            box.innerHTML += `<div class="cart-item"><span>${{item.name}}</span><span>${{item.price}} <span onclick="remItem(${{i}})" style="color:red;cursor:pointer;">x</span></span></div>`; 
+
+    function cartPrice(p) {{ return parseFloat(String(p).replace(/[^0-9.]/g, '')) || 0; }}
+    function cartLoad(raw) {{
+        cartLines.clear(); cartCount = 0; cartTotal = 0;
+        (Array.isArray(raw) ? raw : []).forEach(i => {{
+            if(!i || !i.name) return;
+            const qty = i.qty > 0 ? i.qty : 1; const line = cartLines.get(i.name);
+            if(line) line.qty += qty; else cartLines.set(i.name, {{ name: i.name, price: i.price, unit: typeof i.unit === 'number' ? i.unit : cartPrice(i.price), qty }});
+            cartCount += qty;
         }});
-        document.getElementById('cart-count').innerText = cart.length; 
-        document.getElementById('cart-total').innerText = total.toFixed(2);
-        document.getElementById('cart-float').style.display = cart.length > 0 ? 'flex' : 'none';
-        localStorage.setItem('titanCart', JSON.stringify(cart));
+        cartLines.forEach(l => {{ cartTotal += l.unit * l.qty; }});
     }}
-    
-    function addToCart(name, price) {{ cart.push({{name, price}}); renderCart(); alert(name + " added!"); }}
-    function remItem(i) {{ cart.splice(i,1); renderCart(); }}
+    function cartFlush() {{ clearTimeout(cartSaveTimer); cartSaveTimer = null; localStorage.setItem('titanCart', JSON.stringify([...cartLines.values()])); }}
+    function cartSave() {{ clearTimeout(cartSaveTimer); cartSaveTimer = setTimeout(cartFlush, 300); }}
+
+    function cartRow(name) {{
+        const line = cartLines.get(name); let row = cartRows.get(name);
+        if(!line) {{ if(row) row.remove(); cartRows.delete(name); return; }}
+        if(!row) {{
+            row = document.createElement('div'); row.className = 'cart-item'; row.dataset.id = name;
+            row.innerHTML = '<span class="ci-name"></span><span><button data-act="-1" aria-label="Decrease" style="cursor:pointer;">&minus;</button> <span class="ci-qty"></span> <button data-act="1" aria-label="Increase" style="cursor:pointer;">+</button> <span class="ci-price"></span> <span data-act="x" style="color:red;cursor:pointer;">x</span></span>';
+            row.querySelector('.ci-name').textContent = name;
+            cartRows.set(name, row); document.getElementById('cart-items').appendChild(row);
+        }}
+        row.querySelector('.ci-qty').textContent = line.qty;
+        row.querySelector('.ci-price').textContent = line.price;
+    }}
+    function cartTotals() {{
+        if(cartCount <= 0) {{ cartCount = 0; cartTotal = 0; }}
+        document.getElementById('cart-count').innerText = cartCount;
+        document.getElementById('cart-total').innerText = cartTotal.toFixed(2);
+        document.getElementById('cart-float').style.display = cartCount > 0 ? 'flex' : 'none';
+    }}
+    function renderCart() {{
+        cartRows.forEach(r => r.remove()); cartRows.clear();
+        cartLines.forEach((l, name) => cartRow(name)); cartTotals();
+    }}
+    function cartChange(name, delta) {{
+        const line = cartLines.get(name); if(!line) return;
+        const qty = Math.max(0, line.qty + delta); cartCount += qty - line.qty; cartTotal += (qty - line.qty) * line.unit;
+        if(qty === 0) cartLines.delete(name); else line.qty = qty;
+        cartRow(name); cartTotals(); cartSave();
+    }}
+
+    function addToCart(name, price) {{
+        const line = cartLines.get(name);
+        if(line) line.qty += 1; else cartLines.set(name, {{ name, price, unit: cartPrice(price), qty: 1 }});
+        cartCount += 1; cartTotal += cartLines.get(name).unit;
+        cartRow(name); cartTotals(); cartSave(); alert(name + " added!");
+    }}
+    function remItem(name) {{ const line = cartLines.get(name); if(line) cartChange(name, -line.qty); }}
     function toggleCart() {{ const m = document.getElementById('cart-modal'); m.style.display = m.style.display === 'block' ? 'none' : 'block'; document.getElementById('cart-overlay').style.display = m.style.display; }}
-    
+
+    document.getElementById('cart-items').addEventListener('click', (e) => {{
+        const btn = e.target.closest('[data-act]'); if(!btn) return;
+        const name = btn.closest('.cart-item').dataset.id;
+        if(btn.dataset.act === 'x') remItem(name); else cartChange(name, parseInt(btn.dataset.act));
+    }});
+    window.addEventListener('storage', (e) => {{ if(e.key === 'titanCart') {{ cartLoad(JSON.parse(e.newValue || '[]')); renderCart(); }} }});
+    window.addEventListener('pagehide', () => {{ if(cartSaveTimer) cartFlush(); }});
+
     function checkoutWhatsApp() {{
         const n = document.getElementById('vault-name').value; const a = document.getElementById('vault-address').value;
         localStorage.setItem('t_name', n); localStorage.setItem('t_addr', a);
-        let msg = "New Order:%0A"; let total = 0;
-        cart.forEach(i => {{ msg += `- ${{i.name}} (${{i.price}})%0A`; total += parseFloat(i.price.replace(/[^0-9.]/g,'')) || 0; }});
-        msg += `%0ATotal: ${{total.toFixed(2)}}%0A`; 
+        let msg = "New Order:%0A";
+        cartLines.forEach(i => {{ msg += `- ${{i.name}} x${{i.qty}} (${{i.price}})%0A`; }});
+        msg += `%0ATotal: ${{cartTotal.toFixed(2)}}%0A`; 
         if(n) msg += `%0ADeliver to: ${{n}}, ${{a}}`;
         {f"msg += '%0A(Variant: ' + localStorage.getItem('titan_ab') + ')';" if enable_ab else ""}
         msg += `%0A%0AUPI: {upi_id} | PayPal: {paypal_link}`;
         window.open(`https://wa.me/{clean_wa}?text=${{msg}}`, '_blank');
-        cart = []; renderCart(); toggleCart();
+        cartLines.clear(); cartCount = 0; cartTotal = 0; renderCart(); cartFlush(); toggleCart();
     }}
-    window.addEventListener('load', renderCart);
+    try {{ cartLoad(JSON.parse(localStorage.getItem('titanCart'))); }} catch(e) {{ cartLoad([]); }}
+    renderCart();
     </script>
     """
 
@@ -679,7 +812,7 @@ def gen_wa_widget():
     clean_wa = wa_num.replace("+", "").replace(" ", "").replace("-", "")
     return f"""
     <a href="https://wa.me/{clean_wa}" target="_blank" id="wa-widget" aria-label="Chat on WhatsApp">
-        <svg viewBox="0 0 24 24" fill="white" width="32" height="32"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg>
+        {svg_icon("whatsapp", 'fill="white" width="32" height="32"')}
     </a>
     <style>
         #wa-widget {{ position: fixed; bottom: 30px; right: 30px; background: #25D366; width: 60px; height: 60px; border-radius: 50%; display: flex; align-items: center; justify-content: center; box-shadow: 0 4px 12px rgba(0,0,0,0.3); z-index: 999; transition: transform 0.3s; }}
@@ -762,25 +895,68 @@ def gen_popup():
     </script>
     """
 
+@st.cache_data(ttl=300, show_spinner="Indexing store catalog...")
+def build_catalog(url):
+    return index_catalog(url)
+
+def gen_catalog_js():
+    return f"""
+    <script defer>
+    var CATALOG_URL = '{"catalog.json" if catalog else ""}';
+    var catalogPromise = null;
+    {CATALOG_JS}
+    async function fetchCatalog() {{
+        if (CATALOG_URL) {{ try {{ const r = await fetch(CATALOG_URL); if (r.ok) return await r.json(); }} catch(e) {{}} }}
+        const res = await fetch('{sheet_url}'); return buildCatalog((await res.text()).split(/\\r\\n|\\n/));
+    }}
+    function loadCatalog() {{ return catalogPromise || (catalogPromise = fetchCatalog()); }}
+    </script>
+    """
+
 def gen_inventory_js(is_demo=False):
     demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
     return f"""
     {gen_csv_parser()}
+    {gen_catalog_js()}
     <script defer>
     {demo_flag}
+    var CAT = null, catView = [], catShown = 0, CAT_PAGE = 48, catQuery = '';
+    (window.titanWarmers = window.titanWarmers || {{}}).item = i => CAT.rows[i];
+    function catCard(i) {{
+        const r = CAT.rows[i]; const mainImg = r[4] ? r[4].split('|')[0].trim() : '{img_url(custom_feat, 640)}'; const pName = encodeURIComponent(r[0]);
+        return `<div class="card reveal"><img src="${{mainImg}}" class="prod-img" width="300" height="250" loading="lazy" alt="${{r[0]}}"><div class="card-body"><h3>${{r[0]}}</h3><p style="font-weight:bold; color:var(--s); font-size:1.1rem;">${{r[1]}}${{r[8] ? '' : ' <span class="blog-badge">Sold Out</span>'}}</p><p class="card-desc">${{r[3]}}</p><div style="margin-top:auto; display:grid; grid-template-columns:1fr 1fr; gap:10px;"><button onclick="addToCart(CAT.rows[${{i}}][0], CAT.rows[${{i}}][1])" class="btn btn-primary" style="padding:0.5rem; font-size:0.8rem;"${{r[8] ? '' : ' disabled'}}>Add</button><a href="product.html?item=${{pName}}" data-warm="item:${{i}}" class="btn btn-accent" style="padding:0.5rem; font-size:0.8rem;">View Details</a></div></div></div>`;
+    }}
+    function renderMore() {{
+        const box = document.getElementById('inv-grid');
+        box.insertAdjacentHTML('beforeend', catView.slice(catShown, catShown + CAT_PAGE).map(catCard).join(''));
+        catShown = Math.min(catView.length, catShown + CAT_PAGE);
+        document.getElementById('inv-more').style.display = catShown < catView.length ? 'inline-flex' : 'none';
+    }}
+    function applyFilters() {{
+        // Facets are precomputed index lists: intersect them with a counter array instead of re-scanning rows.
+        const cat = document.getElementById('f-cat').value, pr = document.getElementById('f-price').value, sort = document.getElementById('f-sort').value;
+        const sets = [];
+        if (cat) sets.push(CAT.facets.category[cat]);
+        if (pr !== '') sets.push(CAT.facets.price[pr][1]);
+        if (document.getElementById('f-stock').checked) sets.push(CAT.facets.stock);
+        const order = sort ? CAT.sort[sort] : CAT.order;
+        if (sets.length) {{ const hits = new Uint8Array(CAT.rows.length); sets.forEach(s => s.forEach(i => hits[i]++)); catView = order.filter(i => hits[i] === sets.length); }}
+        else catView = order;
+        // Voice search narrows the whole catalog, not just the cards rendered so far.
+        if (catQuery) catView = catView.filter(i => CAT.text[i].includes(catQuery));
+        const box = document.getElementById('inv-grid'); box.innerHTML = catView.length ? '' : '<div>No products match these filters.</div>'; catShown = 0; renderMore();
+    }}
     async function loadInv() {{
         try {{
-            const res = await fetch('{sheet_url}'); const txt = await res.text(); const lines = txt.split(/\\r\\n|\\n/);
-            const box = document.getElementById('inv-grid'); if(!box) return; box.innerHTML = '';
-            for(let i=1; i<lines.length; i++) {{
-                if(!lines[i].trim()) continue;
-                const c = parseCSVLine(lines[i]);
-                let allImgs = c[3] ? c[3].split('|') : []; let mainImg = allImgs.length > 0 ? allImgs[0] : '{custom_feat}';
-                if(c.length > 1) {{
-                    const pName = encodeURIComponent(c[0]);
-                    box.innerHTML += `<div class="card reveal"><img src="${{mainImg}}" class="prod-img" width="300" height="250" loading="lazy" alt="${{c[0]}}"><div class="card-body"><h3>${{c[0]}}</h3><p style="font-weight:bold; color:var(--s); font-size:1.1rem;">${{c[1]}}</p><p class="card-desc">${{c[2]}}</p><div style="margin-top:auto; display:grid; grid-template-columns:1fr 1fr; gap:10px;"><button onclick="addToCart('${{c[0]}}', '${{c[1]}}')" class="btn btn-primary" style="padding:0.5rem; font-size:0.8rem;">Add</button><a href="product.html?item=${{pName}}" class="btn btn-accent" style="padding:0.5rem; font-size:0.8rem;">View Details</a></div></div></div>`;
-                }}
-            }}
+            const t0 = performance.now(); const box = document.getElementById('inv-grid'); if(!box) return;
+            CAT = await loadCatalog(); CAT.order = CAT.rows.map((r, i) => i); CAT.text = CAT.rows.map(r => (r[0] + ' ' + r[3] + ' ' + r[7]).toLowerCase());
+            const cats = Object.keys(CAT.facets.category).sort();
+            document.getElementById('f-cat').insertAdjacentHTML('beforeend', cats.map(c => `<option value="${{mdEsc(c)}}">${{mdEsc(c)}} (${{CAT.facets.category[c].length}})</option>`).join(''));
+            document.getElementById('f-cat').style.display = cats.length ? '' : 'none';
+            document.getElementById('f-price').insertAdjacentHTML('beforeend', CAT.facets.price.map((p, k) => `<option value="${{k}}">${{p[0]}}</option>`).join(''));
+            document.getElementById('inv-filters').style.display = CAT.rows.length > 1 ? 'flex' : 'none';
+            applyFilters();
+            {rum_mark('sheet')}
         }} catch(e) {{ console.log(e); }}
     }}
     if(document.getElementById('inv-grid')) window.addEventListener('load', loadInv);
@@ -790,11 +966,12 @@ def gen_inventory_js(is_demo=False):
 def gen_inventory():
     if not show_inventory: return ""
     voice_btn = '<button id="voice-btn" onclick="startVoiceSearch()" aria-label="Voice Search">🎤</button>' if enable_voice else ''
-    return f'<section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container"><div class="section-head reveal"><h2 id="store-title">Store</h2></div><div id="inv-grid" class="grid-3"><div>Loading Edge Data...</div></div></div>{voice_btn}</section>{gen_inventory_js(is_demo=False)}'
+    return f'<section id="inventory" style="background:rgba(0,0,0,0.02)"><div class="container"><div class="section-head reveal"><h2 id="store-title">Store</h2></div><div id="inv-filters" class="inv-filters" style="display:none;"><select id="f-cat" onchange="applyFilters()" aria-label="Category"><option value="">All Categories</option></select><select id="f-price" onchange="applyFilters()" aria-label="Price"><option value="">Any Price</option></select><select id="f-sort" onchange="applyFilters()" aria-label="Sort"><option value="">Featured</option><option value="price_asc">Price: Low to High</option><option value="price_desc">Price: High to Low</option><option value="name">Name: A to Z</option></select><label><input type="checkbox" id="f-stock" onchange="applyFilters()"> In stock</label></div><div id="inv-grid" class="grid-3"><div>Loading Edge Data...</div></div><div style="text-align:center; margin-top:2rem;"><button id="inv-more" class="btn btn-primary" style="display:none;" onclick="renderMore()">Load More</button></div></div>{voice_btn}</section>{gen_inventory_js(is_demo=False)}'
 
 def gen_about_section():
     if not show_gallery: return ""
-    return f'<section id="about"><div class="container"><div class="about-grid"><div class="reveal"><h2 id="about-title">{about_h_in}</h2><div>{format_text(about_short_in)}</div><a href="about.html" class="btn btn-primary" style="margin-top:1rem;">Read More</a></div><img src="{about_img}" class="reveal" style="width:100%; border-radius:var(--radius);" loading="lazy" alt="About Us"></div></div></section>'
+    about_pic = img_html(about_img, "About Us", "(max-width: 768px) 100vw, 50vw", 'class="reveal" loading="lazy" decoding="async"', "width:100%; height:auto; border-radius:var(--radius);")
+    return f'<section id="about"><div class="container"><div class="about-grid"><div class="reveal"><h2 id="about-title">{about_h_in}</h2><div>{format_text(about_short_in)}</div><a href="about.html" class="btn btn-primary" style="margin-top:1rem;">Read More</a></div>{about_pic}</div></div></section>'
 
 def gen_faq_section():
     if not show_faq: return ""
@@ -802,11 +979,11 @@ def gen_faq_section():
     return f'<section id="faq"><div class="container" style="max-width:800px;"><div class="section-head reveal"><h2 id="faq-title">Frequently Asked Questions</h2></div>{items}</div></section>'
 
 def gen_footer():
-    icons = ""
-    if fb_link: icons += f'<a href="{fb_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="Facebook"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>'
-    if ig_link: icons += f'<a href="{ig_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="Instagram"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16.98 0a6.9 6.9 0 0 1 5.08 1.98A6.94 6.94 0 0 1 24 7.02v9.96c0 2.08-.68 3.87-1.98 5.13A7.14 7.14 0 0 1 16.94 24H7.06a7.06 7.06 0 0 1-5.03-1.89A6.96 6.96 0 0 1 0 16.94V7.02C0 2.8 2.8 0 7.02 0h9.96zM7.17 2.1c-1.4 0-2.6.48-3.46 1.33c-.85.85-1.33 2.06-1.33 3.46v10.3c0 1.3.47 2.5 1.33 3.36c.86.85 2.06 1.33 3.46 1.33h9.66c1.4 0 2.6-.48 3.46-1.33c.85-.85 1.33-2.06 1.33-3.46V6.89c0-1.4-.47-2.6-1.33-3.46c-.86-.85-2.06-1.33-3.46-1.33H7.17zm11.97 3.33c.77 0 1.4.63 1.4 1.4c0 .77-.63 1.4-1.4 1.4c-.77 0-1.4-.63-1.4-1.4c0-.77.63-1.4 1.4-1.4zM12 5.76c3.39 0 6.14 2.75 6.14 6.14c0 3.39-2.75 6.14-6.14 6.14c-3.39 0-6.14-2.75-6.14-6.14c0-3.39 2.75-6.14 6.14-6.14zm0 2.1c-2.2 0-3.99 1.79-3.99 4.04c0 2.25 1.79 4.04 3.99 4.04c2.2 0 3.99-1.79 3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04c0-2.25-1.79-4.04-3.99-4.04z"/></svg></a>'
-    if x_link: icons += f'<a href="{x_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="X"><svg class="social-icon" viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>'
-    if li_link: icons += f'<a href="{li_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="LinkedIn"><svg class="social-icon" viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>'
+    icons, social = "", 'class="social-icon"'
+    if fb_link: icons += f'<a href="{fb_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="Facebook">{svg_icon("facebook", social)}</a>'
+    if ig_link: icons += f'<a href="{ig_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="Instagram">{svg_icon("instagram", social)}</a>'
+    if x_link: icons += f'<a href="{x_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="X">{svg_icon("x", social)}</a>'
+    if li_link: icons += f'<a href="{li_link}" target="_blank" style="display:inline-block; margin-right:15px;" aria-label="LinkedIn">{svg_icon("linkedin", social)}</a>'
     
     return f"""
     <footer><div class="container"><div class="footer-grid">
@@ -816,29 +993,72 @@ def gen_footer():
     </div><div style="border-top:1px solid rgba(255,255,255,0.1); margin-top:3rem; padding-top:2rem; text-align:center; color:rgba(255,255,255,0.5);">&copy; {datetime.datetime.now().year} {biz_name}. Powered by Titan Engine.</div></div></footer>
     """
 
-def gen_scripts():
-    return "<script defer>window.addEventListener('scroll', () => { var r = document.querySelectorAll('.reveal'); for (var i = 0; i < r.length; i++) { if (r[i].getBoundingClientRect().top < window.innerHeight - 100) r[i].classList.add('active'); } }); window.dispatchEvent(new Event('scroll'));</script>"
+EMBED_HEIGHT = re.compile(r'height\s*[:=]\s*["\']?(\d+)')
+
+def gen_embed_facade(embed_html, label):
+    # Heavy third-party embeds ship inside a <template>; gen_embed_loader() mounts them near the viewport or on click.
+    if not embed_html or not embed_html.strip(): return ""
+    m = EMBED_HEIGHT.search(embed_html)
+    height = f"{m.group(1)}px" if m else "450px"
+    return f'<div class="embed-facade" data-embed style="min-height:{height};"><button type="button" class="btn btn-primary">{label}</button><template>{embed_html}</template></div>'
+
+def gen_embed_loader():
+    return """<script defer>
+    (function() {
+        function mount(el) {
+            if (el.dataset.loaded) return; el.dataset.loaded = '1';
+            const frag = el.querySelector('template').content.cloneNode(true);
+            frag.querySelectorAll('script').forEach(old => { const s = document.createElement('script'); for (const a of old.attributes) s.setAttribute(a.name, a.value); s.text = old.text; old.replaceWith(s); });
+            el.replaceChildren(frag); el.classList.add('loaded');
+        }
+        const facades = document.querySelectorAll('[data-embed]');
+        facades.forEach(el => el.addEventListener('click', () => mount(el), { once: true }));
+        if (!('IntersectionObserver' in window)) { window.addEventListener('load', () => facades.forEach(mount)); return; }
+        const io = new IntersectionObserver((entries) => { entries.forEach(e => { if (e.isIntersecting) { io.unobserve(e.target); mount(e.target); } }); }, { rootMargin: '200px 0px' });
+        facades.forEach(el => io.observe(el));
+    })();
+    </script>"""
 
-def build_page(title, content, extra_js=""):
+def gen_scripts():
+    if anim_type == "None": return ""
+    # Observe each .reveal once, stop watching it after it is shown, and pick up cards injected later by loadInv()/loadBlog().
+    return """<script defer>
+    (function() {
+        if (!('IntersectionObserver' in window) || matchMedia('(prefers-reduced-motion: reduce)').matches) { document.documentElement.classList.add('no-reveal'); return; }
+        const io = new IntersectionObserver((entries) => { entries.forEach(e => { if (e.isIntersecting) { e.target.classList.add('active'); io.unobserve(e.target); } }); }, { rootMargin: '0px 0px -100px 0px' });
+        const each = (node, fn) => { if (node.nodeType !== 1) return; if (node.matches('.reveal:not(.active)')) fn(node); node.querySelectorAll('.reveal:not(.active)').forEach(fn); };
+        const watch = el => io.observe(el); const unwatch = el => io.unobserve(el);
+        each(document.body, watch);
+        new MutationObserver((records) => { records.forEach(r => { r.addedNodes.forEach(n => each(n, watch)); r.removedNodes.forEach(n => each(n, unwatch)); }); }).observe(document.body, { childList: true, subtree: true });
+    })();
+    </script>"""
+
+def build_page(title, content, extra_js="", description=None, schema_html=None, css_href=None):
+    description = seo_d if description is None else description
     # This line captures the ID from your sidebar
     gsc_meta = f'<meta name="google-site-verification" content="{gsc_tag}">' if gsc_tag else ""
     
-    og_meta = f'<meta property="og:title" content="{title} | {biz_name}"><meta property="og:description" content="{seo_d}"><meta property="og:image" content="{og_image or logo_url}"><meta name="twitter:card" content="summary_large_image">'
-    pwa_tags = f'<link rel="manifest" href="manifest.json"><meta name="theme-color" content="{p_color}"><link rel="apple-touch-icon" href="{pwa_icon}">'
+    og_meta = f'<meta property="og:title" content="{title} | {biz_name}"><meta property="og:description" content="{description}"><meta property="og:image" content="{og_url(og_image or logo_url)}"><meta name="twitter:card" content="summary_large_image">'
+    touch_icon = img_assets.get(pwa_icon, {}).get("icons", {}).get(192, pwa_icon)
+    pwa_tags = f'<link rel="manifest" href="manifest.json"><meta name="theme-color" content="{p_color}"><link rel="apple-touch-icon" href="{touch_icon}">'
     sw_script = "<script>if ('serviceWorker' in navigator) { navigator.serviceWorker.register('service-worker.js'); }</script>"
 
     # We added <link rel="preload"> for the fonts, and added &display=swap
     # We also ensured all JS in the <head> uses 'defer'
     ga_script_opt = f"<script async src='https://www.googletagmanager.com/gtag/js?id={ga_tag}'></script><script>window.dataLayer = window.dataLayer ||[]; function gtag(){{dataLayer.push(arguments);}} gtag('js', new Date()); gtag('config', '{ga_tag}');</script>" if ga_tag else ""
 
+    anim = f' data-anim="{ANIMATIONS[anim_type]}"' if ANIMATIONS[anim_type] else ""
+
     return f"""<!DOCTYPE html>
-<html lang="en">
+<html lang="en" data-theme="{THEMES[theme_mode]['slug']}"{anim}>
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{title} | {biz_name}</title>
-    <meta name="description" content="{seo_d}">
-    {gsc_meta}{og_meta}{pwa_tags}{gen_schema()}
+    {gen_prepaint_script()}
+    {gen_rum_script()}
+    <meta name="description" content="{description}">
+    {gsc_meta}{og_meta}{pwa_tags}{gen_schema() if schema_html is None else schema_html}
     
     <!-- Preload critical fonts to stop render blocking -->
     <link rel="preconnect" href="https://fonts.googleapis.com">
@@ -847,7 +1067,8 @@ def build_page(title, content, extra_js=""):
     <link rel="stylesheet" href="https://fonts.googleapis.com/css2?family={h_font.replace(' ', '+')}:wght@400;700;900&family={b_font.replace(' ', '+')}:wght@300;400;600&display=swap" media="print" onload="this.media='all'">
     <noscript><link rel="stylesheet" href="https://fonts.googleapis.com/css2?family={h_font.replace(' ', '+')}:wght@400;700;900&family={b_font.replace(' ', '+')}:wght@300;400;600&display=swap"></noscript>
     
-    <style>{get_theme_css()}</style>
+    <link rel="stylesheet" href="{BASE_CSS_HREF}">
+    {f'<link rel="stylesheet" href="{css_href}">' if css_href else f'<style>{get_theme_css()}{gen_ab_css()}</style>'}
     
     <!-- Deferred Scripts (Will not block rendering) -->
     {ga_script_opt}
@@ -865,6 +1086,8 @@ def build_page(title, content, extra_js=""):
         {extra_js}
     </main>
     {gen_scripts()}
+    {gen_embed_loader() if 'data-embed' in content else ''}
+    {gen_prefetch_script()}
     {sw_script}
 </body>
 </html>"""
@@ -872,27 +1095,30 @@ def build_page(title, content, extra_js=""):
 
 def gen_booking_content():
     if not show_booking: return ""
-    return f'<section class="hero" style="min-height:30vh; background:var(--p);"><div class="container hero-content"><h1>{booking_title}</h1><p>{booking_desc}</p></div></section><section><div class="container" style="text-align:center;"><div style="background:white; border-radius:12px; overflow:hidden; box-shadow:0 10px 40px rgba(0,0,0,0.1); width:100%;">{booking_embed}</div></div></section>'
+    return f'<section class="hero" style="min-height:30vh; background:var(--p);"><div class="container hero-content"><h1>{booking_title}</h1><p>{booking_desc}</p></div></section><section><div class="container" style="text-align:center;"><div style="background:white; border-radius:12px; overflow:hidden; box-shadow:0 10px 40px rgba(0,0,0,0.1); width:100%;">{gen_embed_facade(booking_embed, "📅 Load Booking Calendar")}</div></div></section>'
 
 def gen_blog_index_html():
     if not show_blog: return ""
     return f"""
-    <section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{hero_img_1}'); background-size: cover;">
+    <section class="hero" style="min-height:40vh; background-image: linear-gradient(rgba(0,0,0,0.6), rgba(0,0,0,0.6)), url('{img_url(hero_img_1, 1920)}'); background-size: cover;">
         <div class="container hero-content"><h1>{blog_hero_title}</h1><p>{blog_hero_sub}</p></div>
     </section>
     <section><div class="container"><div id="blog-grid" class="grid-3">Loading Posts...</div></div></section>
     {gen_csv_parser()}
     <script defer>
+    var BLOG = []; (window.titanWarmers = window.titanWarmers || {{}}).post = i => BLOG[i];
     async function loadBlog() {{ 
         try {{ 
             const res = await fetch('{blog_sheet_url}'); const txt = await res.text(); const lines = txt.split(/\\r\\n|\\n/); 
-            const box = document.getElementById('blog-grid'); box.innerHTML = ''; 
+            const box = document.getElementById('blog-grid'); const cards = []; 
             for(let i=1; i<lines.length; i++) {{ 
                 const r = parseCSVLine(lines[i]); 
                 if(r.length > 4) {{ 
-                    box.innerHTML += `<article class="card reveal" style="display:flex; flex-direction:column; justify-content:space-between;"><div><img src="${{r[5]}}" class="prod-img" loading="lazy" alt="${{r[1]}}"><span class="blog-badge" style="margin-top:1rem;">${{r[3]}}</span><h3 style="margin-top:0.5rem;"><a href="post.html?id=${{r[0]}}">${{r[1]}}</a></h3><p>${{r[4]}}</p></div><a href="post.html?id=${{r[0]}}" class="btn btn-primary" style="margin-top:1rem; width:100%;">Read More</a></article>`; 
+                    const w = BLOG.push(r) - 1;
+                    cards.push(`<article class="card reveal" style="display:flex; flex-direction:column; justify-content:space-between;"><div><img src="${{r[5]}}" class="prod-img" loading="lazy" alt="${{r[1]}}"><span class="blog-badge" style="margin-top:1rem;">${{r[3]}}</span><h3 style="margin-top:0.5rem;"><a href="post.html?id=${{r[0]}}" data-warm="post:${{w}}">${{r[1]}}</a></h3><p>${{r[4]}}</p></div><a href="post.html?id=${{r[0]}}" data-warm="post:${{w}}" class="btn btn-primary" style="margin-top:1rem; width:100%;">Read More</a></article>`); 
                 }} 
             }} 
+            box.innerHTML = cards.join(''); 
         }} catch(e) {{ console.log(e); }} 
     }} 
     window.addEventListener('load', loadBlog);
@@ -901,27 +1127,29 @@ def gen_blog_index_html():
 
 def gen_product_page_content(is_demo=False):
     demo_flag = "const isDemo = true;" if is_demo else "const isDemo = false;"
-    ar_script = '<script type="module" src="https://ajax.googleapis.com/ajax/libs/model-viewer/3.4.0/model-viewer.min.js"></script>' if enable_ar else ''
     return f"""
-    {ar_script}
     <section style="padding-top:150px;"><div class="container"><a href="index.html#inventory" class="btn btn-outline" style="margin-bottom:2rem; border:2px solid var(--p);">&larr; Back to Store</a><div id="product-detail">Loading Product Data...</div></div></section>
     {gen_csv_parser()}
+    {gen_catalog_js()}
     <script defer>
     {demo_flag}
     function changeImg(src) {{ document.getElementById('main-img').src = src; }}
     async function loadProduct() {{
         const params = new URLSearchParams(window.location.search); let targetName = params.get('item'); if(isDemo && !targetName) targetName = "Demo Item";
         try {{
-            const res = await fetch('{sheet_url}'); const txt = await res.text(); const lines = txt.split(/\\r\\n|\\n/);
-            for(let i=1; i<lines.length; i++) {{
-                const clean = parseCSVLine(lines[i]); if(isDemo) targetName = clean[0];
+            const t0 = performance.now(); let warm = null; try {{ warm = JSON.parse(sessionStorage.getItem('titan-warm-item')); }} catch(e) {{}}
+            const cat = !isDemo && warm && warm[0] === targetName ? {{ rows: [warm] }} : await loadCatalog();
+            for(const r of cat.rows) {{
+                const clean = [r[0], r[1], r[3], r[4], r[5], r[6]]; if(isDemo) targetName = clean[0];
                 if(clean[0] === targetName) {{
-                    let allImgs = clean[3] ? clean[3].split('|') : ['{custom_feat}'];
+                    let allImgs = clean[3] ? clean[3].split('|') : ['{img_url(custom_feat)}'];
                     let mainImg = allImgs[0]; let thumbHtml = '';
                     allImgs.forEach(img => {{ thumbHtml += `<img src="${{img.trim()}}" class="thumb" onclick="changeImg('${{img.trim()}}')" alt="Thumbnail">`; }});
                     
                     let mainMedia = `<img src="${{mainImg}}" id="main-img" style="width:100%; border-radius:12px; height:400px; object-fit:cover;" alt="${{clean[0]}}">`;
                     if({str(enable_ar).lower()} && clean.length > 5 && clean[5].includes('.glb')) {{
+                        // model-viewer is only fetched for rows that actually have a .glb model
+                        if(!customElements.get('model-viewer') && !document.getElementById('mv-lib')) {{ const mv = document.createElement('script'); mv.id = 'mv-lib'; mv.type = 'module'; mv.src = 'https://ajax.googleapis.com/ajax/libs/model-viewer/3.4.0/model-viewer.min.js'; document.head.appendChild(mv); }}
                         mainMedia = `<model-viewer src="${{clean[5]}}" ar ar-modes="webxr scene-viewer quick-look" camera-controls tone-mapping="neutral" shadow-intensity="1" auto-rotate></model-viewer><p style="text-align:center; font-size:0.8rem; margin-top:10px;">👆 Drag to rotate. Click AR icon to view in your space.</p>`;
                     }}
 
@@ -938,11 +1166,11 @@ def gen_product_page_content(is_demo=False):
                                 <div style="margin-top:2rem; border-top:1px solid rgba(128,128,128,0.2); padding-top:1.5rem;">
                                     <p style="font-size:0.9rem; font-weight:bold; margin-bottom:0.5rem;">Share this product:</p>
                                     <div class="share-row">
-                                        <a href="https://wa.me/?text=Check%20out%20${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa" title="Share on WhatsApp"><svg viewBox="0 0 24 24"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>
-                                        <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb" title="Share on Facebook"><svg viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>
-                                        <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x" title="Share on X"><svg viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>
-                                        <a href="https://www.linkedin.com/shareArticle?mini=true&url=${{u}}&title=${{t}}" target="_blank" class="share-btn bg-li" title="Share on LinkedIn"><svg viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>
-                                        <button onclick="navigator.clipboard.writeText(window.location.href); alert('Link Copied to Clipboard!');" class="share-btn bg-link" title="Copy Link" style="border:none; cursor:pointer;"><svg viewBox="0 0 24 24" fill="white"><path d="M3.9 12c0-1.71 1.39-3.1 3.1-3.1h4V7H7c-2.76 0-5 2.24-5 5s2.24 5 5 5h4v-1.9H7c-1.71 0-3.1-1.39-3.1-3.1zM8 13h8v-2H8v2zm9-6h-4v1.9h4c1.71 0 3.1 1.39 3.1 3.1s-1.39 3.1-3.1 3.1h-4V17h4c2.76 0 5-2.24 5-5s-2.24-5-5-5z"/></svg></button>
+                                        <a href="https://wa.me/?text=Check%20out%20${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa" title="Share on WhatsApp">{svg_icon("whatsapp")}</a>
+                                        <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb" title="Share on Facebook">{svg_icon("facebook")}</a>
+                                        <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x" title="Share on X">{svg_icon("x")}</a>
+                                        <a href="https://www.linkedin.com/shareArticle?mini=true&url=${{u}}&title=${{t}}" target="_blank" class="share-btn bg-li" title="Share on LinkedIn">{svg_icon("linkedin")}</a>
+                                        <button onclick="navigator.clipboard.writeText(window.location.href); alert('Link Copied to Clipboard!');" class="share-btn bg-link" title="Copy Link" style="border:none; cursor:pointer;">{svg_icon("link", 'fill="white"')}</button>
                                     </div>
                                 </div>
                             </div>
@@ -951,6 +1179,7 @@ def gen_product_page_content(is_demo=False):
                     break;
                 }}
             }}
+            {rum_mark('sheet')}
         }} catch(e) {{}}
     }}
     window.addEventListener('load', loadProduct);
@@ -966,10 +1195,12 @@ def gen_blog_post_html():
     async function loadPost() {{
         const params = new URLSearchParams(window.location.search); const slug = params.get('id');
         try {{
-            const res = await fetch('{blog_sheet_url}'); const txt = await res.text(); const lines = txt.split(/\\r\\n|\\n/);
+            let warm = null; try {{ warm = JSON.parse(sessionStorage.getItem('titan-warm-post')); }} catch(e) {{}}
+            let lines = [0, warm];
+            if(!warm || warm[0] !== slug) {{ const res = await fetch('{blog_sheet_url}'); const txt = await res.text(); lines = txt.split(/\\r\\n|\\n/); }}
             const container = document.getElementById('post-container');
             for(let i=1; i<lines.length; i++) {{
-                const r = parseCSVLine(lines[i]);
+                const r = typeof lines[i] === 'string' ? parseCSVLine(lines[i]) : lines[i];
                 if(r[0] === slug) {{
                     const contentHtml = parseMarkdown(r[6]); const u = encodeURIComponent(window.location.href); const t = encodeURIComponent(r[1]);
                     document.title = r[1] + " | {biz_name}";
@@ -985,11 +1216,11 @@ def gen_blog_post_html():
                             <div style="margin-top:4rem; border-top:1px solid rgba(128,128,128,0.2); padding-top:2rem;">
                                 <p style="font-weight:bold; font-size:1.1rem; margin-bottom:0.5rem;">Share this article:</p>
                                 <div class="share-row">
-                                    <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa" title="Share on WhatsApp"><svg viewBox="0 0 24 24"><path d="M12.04 2c-5.46 0-9.91 4.45-9.91 9.91c0 1.75.46 3.45 1.32 4.95L2.05 22l5.25-1.38c1.45.79 3.08 1.21 4.74 1.21c5.46 0 9.91-4.45 9.91-9.91c0-2.65-1.03-5.14-2.9-7.01A9.816 9.816 0 0 0 12.04 2m.01 1.67c2.2 0 4.26.86 5.82 2.42a8.225 8.225 0 0 1 2.41 5.83c0 4.54-3.7 8.23-8.24 8.23c-1.48 0-2.93-.39-4.19-1.15l-.3-.17l-3.12.82l.83-3.04l-.2-.32a8.188 8.188 0 0 1-1.26-4.38c.01-4.54 3.7-8.24 8.25-8.24m-3.53 3.16c-.13 0-.35.05-.54.26c-.19.2-.72.7-.72 1.72s.73 2.01.83 2.14c.1.13 1.44 2.19 3.48 3.07c.49.21.87.33 1.16.43c.49.16.94.13 1.29.08c.4-.06 1.21-.5 1.38-.98c.17-.48.17-.89.12-.98c-.05-.09-.18-.13-.37-.23c-.19-.1-.1.13-.1.13s-1.13-.56-1.32-.66c-.19-.1-.32-.15-.45.05c-.13.2-.51.65-.62.78c-.11.13-.23.15-.42.05c-.19-.1-.8-.3-1.53-.94c-.57-.5-1.02-1.12-1.21-1.45c-.11-.19-.01-.29.09-.38c.09-.08.19-.23.29-.34c.1-.11.13-.19.19-.32c.06-.13.03-.24-.01-.34c-.05-.1-.45-1.08-.62-1.48c-.16-.4-.36-.34-.51-.35c-.11-.01-.25-.01-.4-.01Z"/></path></svg></a>
-                                    <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb" title="Share on Facebook"><svg viewBox="0 0 24 24"><path d="M18 2h-3a5 5 0 0 0-5 5v3H7v4h3v8h4v-8h3l1-4h-4V7a1 1 0 0 1 1-1h3z"></path></svg></a>
-                                    <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x" title="Share on X"><svg viewBox="0 0 24 24"><path d="M18.901 1.153h3.68l-8.04 9.19L24 22.846h-7.406l-5.8-7.584l-6.638 7.584H.474l8.6-9.83L0 1.154h7.594l5.243 6.932ZM17.61 20.644h2.039L6.486 3.24H4.298Z"></path></svg></a>
-                                    <a href="https://www.linkedin.com/shareArticle?mini=true&url=${{u}}&title=${{t}}" target="_blank" class="share-btn bg-li" title="Share on LinkedIn"><svg viewBox="0 0 24 24"><path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2a2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6zM2 9h4v12H2zM4 2a2 2 0 1 1-2 2a2 2 0 0 1 2-2z"></path></svg></a>
-                                    <button onclick="navigator.clipboard.writeText(window.location.href); alert('Link Copied to Clipboard!');" class="share-btn bg-link" title="Copy Link" style="border:none; cursor:pointer;"><svg viewBox="0 0 24 24" fill="white"><path d="M3.9 12c0-1.71 1.39-3.1 3.1-3.1h4V7H7c-2.76 0-5 2.24-5 5s2.24 5 5 5h4v-1.9H7c-1.71 0-3.1-1.39-3.1-3.1zM8 13h8v-2H8v2zm9-6h-4v1.9h4c1.71 0 3.1 1.39 3.1 3.1s-1.39 3.1-3.1 3.1h-4V17h4c2.76 0 5-2.24 5-5s-2.24-5-5-5z"/></svg></button>
+                                    <a href="https://wa.me/?text=${{t}}%20${{u}}" target="_blank" class="share-btn bg-wa" title="Share on WhatsApp">{svg_icon("whatsapp")}</a>
+                                    <a href="https://www.facebook.com/sharer/sharer.php?u=${{u}}" target="_blank" class="share-btn bg-fb" title="Share on Facebook">{svg_icon("facebook")}</a>
+                                    <a href="https://twitter.com/intent/tweet?url=${{u}}&text=${{t}}" target="_blank" class="share-btn bg-x" title="Share on X">{svg_icon("x")}</a>
+                                    <a href="https://www.linkedin.com/shareArticle?mini=true&url=${{u}}&title=${{t}}" target="_blank" class="share-btn bg-li" title="Share on LinkedIn">{svg_icon("linkedin")}</a>
+                                    <button onclick="navigator.clipboard.writeText(window.location.href); alert('Link Copied to Clipboard!');" class="share-btn bg-link" title="Copy Link" style="border:none; cursor:pointer;">{svg_icon("link", 'fill="white"')}</button>
                                 </div>
                             </div>
                             <hr style="margin:2rem 0; border:0; border-top:1px solid rgba(128,128,128,0.2);">
@@ -1007,55 +1238,102 @@ def gen_blog_post_html():
 def gen_inner_header(title):
     return f'<div class="hero" style="min-height: 40vh; background:var(--p);"><div class="container hero-content"><h1>{title}</h1></div></div>'
 
+def gen_landing_content():
+    # Shared by every programmatic landing page; lp_token() markers are filled per CSV row by landing_pages.py.
+    hero = f"""<section class="hero" style="min-height:60vh;"><div class="carousel-slide active" style="background-image: url('{img_url(hero_img_1, 1920)}')"></div><div class="hero-overlay"></div><div class="container hero-content"><h1>{lp_token("headline")}</h1><p>{lp_token("intro")}</p><div style="display:flex; gap:1rem; flex-wrap:wrap; {'justify-content:center;' if hero_layout == 'Center' else ''}"><a href="contact.html" class="btn btn-accent">Contact Us</a><a href="tel:{biz_phone}" class="btn" style="background:rgba(255,255,255,0.2); backdrop-filter:blur(10px); color:white !important;">Call Now</a></div></div></section>"""
+    return hero + (gen_stats() if show_stats else "") + (gen_features() if show_features else "") + f'<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2>Serving {lp_token("location")}</h2><p style="margin-bottom:2rem;">{biz_addr}</p><a href="contact.html" class="btn" style="background:white; color:var(--s) !important;">Get Started</a></div></section>'
+
+def gen_landing_pages(rows, css_href):
+    shell = build_page(lp_token("title"), gen_landing_content(), description=lp_token("description"), schema_html=lp_token("schema"), css_href=css_href)
+    return render_landing_pages(shell, rows, {"biz_name": biz_name, "seo_d": seo_d, "base_url": prod_url.rstrip('/'), "schema": get_schema_data()})
+
+def gen_locations_hub(rows):
+    links = "".join(f'<a href="{r["slug"]}.html" class="card" style="padding:1rem;">{html.escape(r["location"])}</a>' for r in rows)
+    return f'{gen_inner_header("Service Areas")}<section><div class="container"><div class="grid-3">{links}</div></div></section>'
+
+def gen_sitemap(pages):
+    base = prod_url.rstrip('/')
+    urls = "".join(f"<url><loc>{base}/{'' if p == 'index.html' else p}</loc></url>" for p in pages)
+    return f"""<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>"""
+
+def preconnect_origins():
+    # Fonts plus every third-party origin the pages fetch from at runtime; sheet fetches are anonymous CORS requests.
+    origins = {"https://fonts.googleapis.com": False, "https://fonts.gstatic.com": True}
+    for url, cors in ((sheet_url if show_inventory and not catalog else "", True), (blog_sheet_url if show_blog else "", True), (lang_sheet, True), (rum_endpoint, False)):
+        m = re.match(r'(https?://[^/?#]+)', url or "")
+        if m and not url.startswith(prod_url.rstrip("/")): origins.setdefault(m.group(1), cors)
+    return list(origins.items())
+
 # --- 6. PAGE ASSEMBLY ---
-home_content = ""
-if show_hero: home_content += gen_hero()
-if show_stats: home_content += gen_stats()
-if show_features: home_content += gen_features()
-if show_pricing: home_content += gen_pricing_table()
-if show_inventory: home_content += gen_inventory()
-if show_gallery: home_content += gen_about_section()
-if show_testimonials: 
-    t_cards = "".join([f'<div class="card reveal" style="text-align:center;"><i>"{x.split("|")[1]}"</i><br><b>- {x.split("|")[0]}</b></div>' for x in testi_data.split('\n') if "|" in x])
-    home_content += f'<section style="background:#f8fafc"><div class="container"><div class="section-head reveal"><h2>Client Stories</h2></div><div class="grid-3">{t_cards}</div></div></section>'
-if show_faq: home_content += gen_faq_section()
-if show_cta: home_content += f'<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2>Start Owning Your Future</h2><p style="margin-bottom:2rem;">Stop paying rent.</p><a href="contact.html" class="btn" style="background:white; color:var(--s) !important;">Get Started</a></div></section>'
+def assemble_site(notify=True):
+    # Data shared by every page. Runs on each full app run (preview) and again before a package build,
+    # since panel-only reruns may have changed the inputs in between.
+    global catalog, img_assets, locations
+    catalog = None
+    if show_inventory and sheet_url and prebuild_catalog:
+        try:
+            catalog, catalog_report = build_catalog(sheet_url)
+            if notify:
+                with tabs[4]:
+                    st.caption(f"📦 {catalog_report['total']} products indexed into catalog.json.")
+                    if catalog_report['dupes']: st.warning(f"Duplicate product names (only the first row is kept): {', '.join(catalog_report['dupes'][:10])}")
+                    if catalog_report['bad_price']: st.warning(f"{catalog_report['bad_price']} rows have a price that could not be read as a number.")
+        except Exception as e:
+            if notify:
+                with tabs[4]: st.error(f"Catalog snapshot failed, the store will read the live sheet instead: {e}")
+
+    # Local images (uploads or paths) are resized and encoded in parallel; unchanged sources come from the in-memory cache.
+    image_files = {f.name: f.getvalue() for f in image_uploads or []}
+    image_refs = [logo_url, pwa_icon, og_image, hero_img_1, hero_img_2, hero_img_3, about_img, custom_feat]
+    if catalog: image_refs += [img.strip() for r in catalog["rows"] if r[4] for img in r[4].split("|")]
+    image_jobs = {}
+    for ref in image_refs:
+        if ref and ref not in image_jobs and (data := read_local_image(ref, image_files)): image_jobs[ref] = (data, image_stem(ref), ref == pwa_icon)
+    img_assets, image_errors = process_images(image_jobs) if image_jobs else ({}, {})
+    if image_jobs and notify:
+        with tabs[0]:
+            if img_assets: st.caption(f"🖼️ {len(img_assets)} local images bundled ({sum(len(a['files']) for a in img_assets.values())} files).")
+            for ref, err in image_errors.items(): st.warning(f"Could not process image {ref}: {err}")
+    if catalog and img_assets:
+        for r in catalog["rows"]:
+            if r[4]: r[4] = "|".join(img_url(img.strip()) for img in r[4].split("|"))
+
+    locations = parse_locations(locations_csv.getvalue().decode("utf-8", "replace")) if locations_csv else []
+
+def gen_home_content():
+    home_content = ""
+    if show_hero: home_content += gen_hero()
+    if show_stats: home_content += gen_stats()
+    if show_features: home_content += gen_features()
+    if show_pricing: home_content += gen_pricing_table()
+    if show_inventory: home_content += gen_inventory()
+    if show_gallery: home_content += gen_about_section()
+    if show_testimonials: 
+        t_cards = "".join([f'<div class="card reveal" style="text-align:center;"><i>"{x.split("|")[1]}"</i><br><b>- {x.split("|")[0]}</b></div>' for x in testi_data.split('\n') if "|" in x])
+        home_content += f'<section style="background:#f8fafc"><div class="container"><div class="section-head reveal"><h2>Client Stories</h2></div><div class="grid-3">{t_cards}</div></div></section>'
+    if show_faq: home_content += gen_faq_section()
+    if show_cta: home_content += f'<section style="background:var(--s); color:white; text-align:center;"><div class="container reveal"><h2>Start Owning Your Future</h2><p style="margin-bottom:2rem;">Stop paying rent.</p><a href="contact.html" class="btn" style="background:white; color:var(--s) !important;">Get Started</a></div></section>'
+    return home_content
+
+def gen_contact_content():
+    return f"""{gen_inner_header("Contact Us")}<section><div class="container"><div class="contact-grid"><div><div style="background:var(--card); padding:2rem; border-radius:12px; border:1px solid #eee;"><h3>Get In Touch</h3><p>{biz_addr}</p><p><a href="tel:{biz_phone}">{biz_phone}</a></p><p>{biz_email}</p><br><a href="https://wa.me/{wa_num}" target="_blank" class="btn btn-accent" style="width:100%;">WhatsApp Us</a></div></div><div class="card"><h3>Send Message</h3><form action="https://formsubmit.co/{biz_email}" method="POST"><label>Name</label><input type="text" name="name" required><label>Email</label><input type="email" name="email" required><label>Message</label><textarea name="msg" rows="4" required></textarea><button class="btn btn-primary" type="submit">Send</button></form></div></div><br><div style="border-radius:12px;overflow:hidden;">{gen_embed_facade(map_iframe, '📍 Show Map')}</div></div></section>"""
+
+assemble_site()
 
 # --- 7. DEPLOYMENT ---
 st.divider()
 st.subheader("🚀 2050 Launchpad")
-preview_mode = st.radio("Preview Page:", ["Home", "About", "Contact", "Blog Index", "Blog Post (Demo)", "Privacy", "Terms", "Product Detail (Demo)", "Booking Page"], horizontal=True)
-
-contact_content = f"""{gen_inner_header("Contact Us")}<section><div class="container"><div class="contact-grid"><div><div style="background:var(--card); padding:2rem; border-radius:12px; border:1px solid #eee;"><h3>Get In Touch</h3><p>{biz_addr}</p><p><a href="tel:{biz_phone}">{biz_phone}</a></p><p>{biz_email}</p><br><a href="https://wa.me/{wa_num}" target="_blank" class="btn btn-accent" style="width:100%;">WhatsApp Us</a></div></div><div class="card"><h3>Send Message</h3><form action="https://formsubmit.co/{biz_email}" method="POST"><label>Name</label><input type="text" name="name" required><label>Email</label><input type="email" name="email" required><label>Message</label><textarea name="msg" rows="4" required></textarea><button class="btn btn-primary" type="submit">Send</button></form></div></div><br><div style="border-radius:12px;overflow:hidden;">{map_iframe}</div></div></section>"""
+preview_mode = st.radio("Preview Page:", [p for p in PREVIEW_PAGES if p != "Landing Page (Demo)" or locations], horizontal=True, key="preview_mode")
 
-c1, c2 = st.columns([3, 1])
-with c1:
-    if preview_mode == "Home": st.components.v1.html(build_page("Home", home_content), height=600, scrolling=True)
-    # ADDED <section> tag here:
-    elif preview_mode == "About": st.components.v1.html(build_page("About", f"{gen_inner_header('About')}<section><div class='container'>{format_text(about_long)}</div></section>"), height=600, scrolling=True)
-    elif preview_mode == "Contact": st.components.v1.html(build_page("Contact", contact_content), height=600, scrolling=True)
-    # ADDED <section> tag here:
-    elif preview_mode == "Privacy": st.components.v1.html(build_page("Privacy", f"{gen_inner_header('Privacy')}<section><div class='container'>{format_text(priv_txt)}</div></section>"), height=600, scrolling=True)
-    # ADDED <section> tag here:
-    elif preview_mode == "Terms": st.components.v1.html(build_page("Terms", f"{gen_inner_header('Terms')}<section><div class='container'>{format_text(term_txt)}</div></section>"), height=600, scrolling=True)
-    elif preview_mode == "Blog Index": st.components.v1.html(build_page("Blog", gen_blog_index_html()), height=600, scrolling=True)
-    elif preview_mode == "Blog Post (Demo)": st.components.v1.html(build_page("Article", gen_blog_post_html()), height=600, scrolling=True)
-    elif preview_mode == "Product Detail (Demo)":
-        st.info("ℹ️ Demo Mode Active: Showing the first available product from your CSV.")
-        st.components.v1.html(build_page("Product", gen_product_page_content(is_demo=True)), height=600, scrolling=True)
-    elif preview_mode == "Booking Page":
-        st.components.v1.html(build_page("Book Now", gen_booking_content()), height=600, scrolling=True)
-
-with c2:
-    st.success("2050 Architecture Compiled.")
-    
-    # Generate Zip in Memory
-    z_b = io.BytesIO()
-    with zipfile.ZipFile(z_b, "a", zipfile.ZIP_DEFLATED, False) as zf:
-        zf.writestr("index.html", build_page("Home", home_content))
+def build_package(check=lambda: None):
+    # check() raises BuildCancelled once a newer build of the same session is queued.
+    # Deflated entries are reused from the artifact store by content hash, so unchanged files are not recompressed.
+    with PackageZip() as zf:
+        zf.writestr("index.html", build_page("Home", gen_home_content()))
         zf.writestr("about.html", build_page("About", f"{gen_inner_header('About')}<section><div class='container'>{format_text(about_long)}</div></section>"))
-        zf.writestr("contact.html", build_page("Contact", contact_content))
+        zf.writestr("contact.html", build_page("Contact", gen_contact_content()))
         zf.writestr("privacy.html", build_page("Privacy", f"{gen_inner_header('Privacy')}<section><div class='container'>{format_text(priv_txt)}</div></section>"))
+        check()
         zf.writestr("terms.html", build_page("Terms", f"{gen_inner_header('Terms')}<section><div class='container'>{format_text(term_txt)}</div></section>"))
         
         if show_booking: 
@@ -1065,28 +1343,127 @@ with c2:
         if show_blog: 
             zf.writestr("blog.html", build_page("Blog", gen_blog_index_html()))
             zf.writestr("post.html", build_page("Article", gen_blog_post_html()))
+        check()
         
+        if locations: 
+            # One stylesheet shared by every landing page instead of inlining it thousands of times.
+            shared_css = get_theme_css() + gen_ab_css()
+            css_href = f"assets/titan.{hashlib.sha256(shared_css.encode()).hexdigest()[:10]}.css"
+            zf.writestr(css_href, shared_css)
+            for name, page in gen_landing_pages(locations, css_href): 
+                zf.writestr(name, page)
+            zf.writestr("locations.html", build_page("Service Areas", gen_locations_hub(locations), css_href=css_href))
+            check()
+        
+        if catalog: 
+            zf.writestr("catalog.json", json.dumps(catalog, separators=(",", ":"), ensure_ascii=False))
+        for a in img_assets.values():
+            for path, data in a["files"].items():
+                # Already compressed: store instead of deflating again.
+                zf.writestr(path, data, compress_type=zipfile.ZIP_STORED)
+        zf.writestr(BASE_CSS_HREF, BASE_CSS)
+        zf.writestr(ICON_SPRITE_HREF, ICON_SPRITE)
         zf.writestr("manifest.json", gen_pwa_manifest())
         zf.writestr("service-worker.js", gen_sw())
         zf.writestr("robots.txt", f"User-agent: *\nAllow: /\nSitemap: {prod_url}/sitemap.xml")
-        zf.writestr("sitemap.xml", f"""<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url><loc>{prod_url}/</loc></url></urlset>""")
-
-    # IPFS OR ZIP DOWNLOAD
-    if pinata_jwt:
-        if st.button("🌌 PUSH TO Web3 (IPFS)", type="primary"):
-            with st.spinner("Encrypting and uploading to IPFS Blockchain..."):
-                try:
-                    url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
-                    headers = {"Authorization": f"Bearer {pinata_jwt}"}
-                    files = {"file": ("titan_site.zip", z_b.getvalue())}
-                    res = requests.post(url, headers=headers, files=files)
-                    if res.status_code == 200:
-                        cid = res.json()['IpfsHash']
-                        st.success(f"Deployed! Live forever on IPFS.")
-                        st.markdown(f"**Gateway Link:** [ipfs.io/ipfs/{cid}](https://ipfs.io/ipfs/{cid})")
-                    else:
-                        st.error(f"IPFS Error: {res.text}")
-                except Exception as e:
-                    st.error(f"Upload failed: {e}")
-    else:
-        st.download_button("📥 DOWNLOAD 2050 PACKAGE", z_b.getvalue(), f"{biz_name.lower().replace(' ','_')}_apex.zip", "application/zip", type="primary")
+        zf.writestr("sitemap.xml", gen_sitemap([n for n in zf.namelist() if n.endswith(".html") and n not in ("product.html", "post.html")]))
+        # Host configs last, so they cover every file in the package.
+        for name, text in render_host_configs(zf.namelist(), preconnect_origins()).items():
+            zf.writestr(name, text)
+    return zf.getvalue()
+
+def snapshot_namespace():
+    # Builds run on worker threads against a frozen copy of the script globals, so edits made while a
+    # build is in flight cannot leak into it half-way.
+    live = globals()
+    ns = dict(live)
+    for name, fn in live.items():
+        if isinstance(fn, types.FunctionType) and fn.__globals__ is live:
+            ns[name] = types.FunctionType(fn.__code__, ns, fn.__name__, fn.__defaults__, fn.__closure__)
+    return ns
+
+def build_key():
+    # Everything build_package() reads: the panel values, the data assemble_site() fetched or derived
+    # (image file names carry their content hash) and the footer year. The compiler version is mixed in by the store.
+    h = hashlib.sha256(repr(sorted((k, v) for k, v in st.session_state.items() if k.startswith("_panel_"))).encode())
+    h.update(json.dumps([catalog, sorted(p for a in img_assets.values() for p in a["files"]), datetime.date.today().year]).encode())
+    return h.hexdigest()
+
+def queue_build():
+    # One build per distinct editor state; a newer one supersedes whatever this session has in flight.
+    # A package any session has already built for the same inputs comes straight from the artifact store.
+    sid = st.session_state.setdefault("build_session", uuid.uuid4().hex)
+    key = build_key()
+    ns = snapshot_namespace()
+    return BUILDS.submit(sid, key, lambda check: ARTIFACTS.memo("package", key, lambda: ns["build_package"](check)))
+
+c1, c2 = st.columns([3, 1])
+with c1:
+    if preview_mode == "Home": st.components.v1.html(preview_html(build_page("Home", gen_home_content())), height=600, scrolling=True)
+    # ADDED <section> tag here:
+    elif preview_mode == "About": st.components.v1.html(preview_html(build_page("About", f"{gen_inner_header('About')}<section><div class='container'>{format_text(about_long)}</div></section>")), height=600, scrolling=True)
+    elif preview_mode == "Contact": st.components.v1.html(preview_html(build_page("Contact", gen_contact_content())), height=600, scrolling=True)
+    # ADDED <section> tag here:
+    elif preview_mode == "Privacy": st.components.v1.html(preview_html(build_page("Privacy", f"{gen_inner_header('Privacy')}<section><div class='container'>{format_text(priv_txt)}</div></section>")), height=600, scrolling=True)
+    # ADDED <section> tag here:
+    elif preview_mode == "Terms": st.components.v1.html(preview_html(build_page("Terms", f"{gen_inner_header('Terms')}<section><div class='container'>{format_text(term_txt)}</div></section>")), height=600, scrolling=True)
+    elif preview_mode == "Blog Index": st.components.v1.html(preview_html(build_page("Blog", gen_blog_index_html())), height=600, scrolling=True)
+    elif preview_mode == "Blog Post (Demo)": st.components.v1.html(preview_html(build_page("Article", gen_blog_post_html())), height=600, scrolling=True)
+    elif preview_mode == "Product Detail (Demo)":
+        st.info("ℹ️ Demo Mode Active: Showing the first available product from your CSV.")
+        st.components.v1.html(preview_html(build_page("Product", gen_product_page_content(is_demo=True))), height=600, scrolling=True)
+    elif preview_mode == "Booking Page":
+        st.components.v1.html(preview_html(build_page("Book Now", gen_booking_content())), height=600, scrolling=True)
+    elif preview_mode == "Landing Page (Demo)":
+        st.info(f"ℹ️ Showing the first of {len(locations)} landing pages.")
+        st.components.v1.html(preview_html(gen_landing_pages(locations[:1], None)[0][1]), height=600, scrolling=True)
+
+with c2:
+    st.success("2050 Architecture Compiled.")
+
+    queue_build()
+
+    # The package is rendered once per finished build: only the status fragment polls, and it reruns the
+    # app when a newer build finishes, so the ZIP is not handed to the download button every poll.
+    last = BUILDS.status(st.session_state.get("build_session"))["last"]
+    st.session_state["package_key"] = last and last["key"]
+
+    @st.fragment(run_every=2)
+    def build_status():
+        status = BUILDS.status(st.session_state.get("build_session"))
+        if status["error"]: st.error(f"Build failed: {status['error']}")
+        if status["building"]: st.caption("⏳ Compiling your latest edits in the background...")
+        with st.expander("📊 Build Queue", expanded=False):
+            st.json(BUILDS.stats())
+            st.caption("Artifact store")
+            st.json(ARTIFACTS.stats())
+        if status["last"] and status["last"]["key"] != st.session_state.get("package_key"): st.rerun(scope="app")
+
+    build_status()
+
+    if last:
+        # The last finished package stays downloadable while a newer one compiles.
+        package = last["data"]
+        st.caption(f"Package built at {datetime.datetime.fromtimestamp(last['finished']).strftime('%H:%M:%S')} in {last['duration']:.2f}s ({len(package) / 1024:,.0f} KB).")
+        
+        # IPFS OR ZIP DOWNLOAD
+        if pinata_jwt:
+            if st.button("🌌 PUSH TO Web3 (IPFS)", type="primary"):
+                with st.spinner("Encrypting and uploading to IPFS Blockchain..."):
+                    try:
+                        url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
+                        headers = {"Authorization": f"Bearer {pinata_jwt}"}
+                        files = {"file": ("titan_site.zip", package)}
+                        res = requests.post(url, headers=headers, files=files)
+                        if res.status_code == 200:
+                            cid = res.json()['IpfsHash']
+                            st.success(f"Deployed! Live forever on IPFS.")
+                            st.markdown(f"**Gateway Link:** [ipfs.io/ipfs/{cid}](https://ipfs.io/ipfs/{cid})")
+                        else:
+                            st.error(f"IPFS Error: {res.text}")
+                    except Exception as e:
+                        st.error(f"Upload failed: {e}")
+        else:
+            st.download_button("📥 DOWNLOAD 2050 PACKAGE", package, f"{biz_name.lower().replace(' ','_')}_apex.zip", "application/zip", type="primary")
+
+APP_RUN = False
@@ -0,0 +1,191 @@
+"""Persistent build artifact store shared by every session and process on the machine.
+
+Entries are addressed by sha256(compiler version, kind, input hash): any edit
+to the compiler sources starts a fresh keyspace (old entries age out), and
+identical inputs from any operator map to the same file. Writes go to a temp
+file and are renamed into place, so concurrent readers never see a partial
+entry. Reads bump the file's mtime; once the store outgrows its budget, one
+process at a time evicts the least recently used entries.
+
+Set TITAN_CACHE_DIR to move the store and TITAN_CACHE_MB to resize it (0 disables it).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction is not coordinated between processes.
+    fcntl = None
+
+COMPILER_MODULES = ("app.py", "markdown_lite.py", "store_catalog.py", "themes.py", "image_pipeline.py", "landing_pages.py", "host_config.py", "package_zip.py", "artifact_cache.py")
+DEFAULT_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "titan-artifacts")
+DEFAULT_MB = 1024
+# Sweep after writing this share of the budget; evict down to LOW_WATER of it.
+SWEEP_EVERY = 0.1
+LOW_WATER = 0.9
+
+
+def source_version(paths):
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            with open(path, "rb") as f: h.update(f.read())
+        except OSError:
+            h.update(path.encode())
+    return h.hexdigest()[:16]
+
+
+def pack(meta, files):
+    """One blob for a JSON-able dict plus named binary files: 4-byte header length, JSON header, file bodies."""
+    header = json.dumps({"meta": meta, "files": [[name, len(data)] for name, data in files.items()]}).encode()
+    return len(header).to_bytes(4, "big") + header + b"".join(files.values())
+
+
+def unpack(blob):
+    n = int.from_bytes(blob[:4], "big")
+    header = json.loads(blob[4:4 + n])
+    files, pos = {}, 4 + n
+    for name, size in header["files"]:
+        files[name] = blob[pos:pos + size]
+        pos += size
+    if pos != len(blob): raise ValueError("truncated bundle")
+    return header["meta"], files
+
+
+class ArtifactCache:
+    def __init__(self, root, max_bytes, version=""):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.version = version
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.kinds = {}
+        self.written = max_bytes  # sweep once on the first write, to pick up what other processes left behind
+        self.disk = None
+        self.writer = None
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, kind, key):
+        digest = hashlib.sha256(f"{self.version}|{kind}|{key}".encode()).hexdigest()
+        return os.path.join(self.root, kind, digest[:2], digest[2:])
+
+    def _count(self, kind, event, n=1):
+        with self.lock:
+            self.counts[event] += n
+            self.kinds.setdefault(kind, Counter())[event] += n
+
+    def get(self, kind, key):
+        if not self.enabled: return None
+        path = self._path(kind, key)
+        try:
+            with open(path, "rb") as f: data = f.read()
+        except OSError:
+            self._count(kind, "misses")
+            return None
+        try: os.utime(path)
+        except OSError: pass
+        self._count(kind, "hits")
+        self._count(kind, "bytes_read", len(data))
+        return data
+
+    def put(self, kind, key, data):
+        if not self.enabled or len(data) > self.max_bytes // 2: return
+        path = self._path(kind, key)
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f: f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp:
+                try: os.unlink(tmp)
+                except OSError: pass
+            self._count(kind, "write_errors")
+            return
+        self._count(kind, "writes")
+        self._count(kind, "bytes_written", len(data))
+        with self.lock:
+            self.written += len(data)
+            due = self.written >= self.max_bytes * SWEEP_EVERY
+            if due: self.written = 0
+        if due: self.sweep()
+
+    def put_async(self, kind, key, data):
+        """put() on a background thread, for callers that store many small entries on the build's critical path."""
+        if not self.enabled: return
+        with self.lock:
+            if self.writer is None: self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+        self.writer.submit(self.put, kind, key, data)
+
+    def get_bundle(self, kind, key):
+        blob = self.get(kind, key)
+        if blob is None: return None
+        try: return unpack(blob)
+        except (ValueError, KeyError, TypeError):
+            self._count(kind, "corrupt")
+            return None
+
+    def put_bundle(self, kind, key, meta, files):
+        self.put(kind, key, pack(meta, files))
+
+    def memo(self, kind, key, fn):
+        """Return the stored bytes for key, or compute them with fn() and store them."""
+        data = self.get(kind, key)
+        if data is None:
+            data = fn()
+            self.put(kind, key, data)
+        return data
+
+    def sweep(self):
+        """Evict least recently used entries until the store is under LOW_WATER of its budget."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as lock:
+            if fcntl:
+                try: fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError: return  # another process is already sweeping
+            entries = []
+            for dirpath, _, names in os.walk(self.root):
+                for name in names:
+                    if name == ".lock": continue
+                    try: st = os.stat(os.path.join(dirpath, name))
+                    except OSError: continue
+                    entries.append((st.st_mtime, st.st_size, os.path.join(dirpath, name)))
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            if total > self.max_bytes:
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= self.max_bytes * LOW_WATER: break
+                    try: os.unlink(path)
+                    except OSError: continue
+                    total -= size
+                    evicted += 1
+            with self.lock:
+                self.counts["evictions"] += evicted
+                self.disk = {"bytes": total, "entries": len(entries) - evicted}
+
+    def stats(self):
+        with self.lock:
+            out = {"dir": self.root, "max_mb": round(self.max_bytes / 2**20), **{k: self.counts[k] for k in ("hits", "misses", "writes", "evictions")}}
+            looked_up = out["hits"] + out["misses"]
+            out["hit_rate"] = round(out["hits"] / looked_up, 3) if looked_up else None
+            out["by_kind"] = {kind: {k: c[k] for k in ("hits", "misses", "writes")} for kind, c in sorted(self.kinds.items())}
+            if self.disk: out["disk_mb"], out["entries"] = round(self.disk["bytes"] / 2**20, 1), self.disk["entries"]
+        return out
+
+
+_here = os.path.dirname(os.path.abspath(__file__))
+ARTIFACTS = ArtifactCache(
+    os.environ.get("TITAN_CACHE_DIR") or DEFAULT_DIR,
+    int(float(os.environ.get("TITAN_CACHE_MB", DEFAULT_MB)) * 2**20),
+    version=source_version([os.path.join(_here, m) for m in COMPILER_MODULES]),
+)
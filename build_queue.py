@@ -0,0 +1,118 @@
+"""Background package builds shared by every editor session.
+
+Builds run on a bounded thread pool instead of the Streamlit script thread.
+Each session has at most one build running and one waiting: a newer edit
+replaces the waiting build and asks the running one to stop at its next
+checkpoint. The last finished package stays available while the next one
+is compiled.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = max(2, min(4, os.cpu_count() or 1))
+MAX_SESSIONS = 64
+DURATION_WINDOW = 200
+
+
+class BuildCancelled(Exception):
+    pass
+
+
+class BuildQueue:
+    def __init__(self, workers=MAX_WORKERS):
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="titan-build")
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()
+        self.pending = 0   # waiting in a session slot or in the pool, not started yet
+        self.active = 0
+        self.durations = deque(maxlen=DURATION_WINDOW)
+        self.counts = {"submitted": 0, "completed": 0, "superseded": 0, "failed": 0}
+
+    def _session(self, sid):
+        s = self.sessions.pop(sid, None) or {"key": None, "running": None, "waiting": None, "last": None, "error": None}
+        self.sessions[sid] = s
+        # Forget the least recently active idle sessions (and their packages).
+        for old in list(self.sessions)[:max(0, len(self.sessions) - MAX_SESSIONS)]:
+            if not self.sessions[old]["running"]: del self.sessions[old]
+        return s
+
+    def submit(self, sid, key, fn):
+        """Queue fn(check) -> bytes for a session; check() raises BuildCancelled once a newer build arrives. Returns False if `key` is already built or building."""
+        with self.lock:
+            s = self._session(sid)
+            if key == s["key"] and not s["error"]: return False
+            job = {"key": key, "fn": fn, "cancel": threading.Event(), "queued": time.monotonic()}
+            s["key"], s["error"] = key, None
+            self.counts["submitted"] += 1
+            if s["waiting"]:
+                self.counts["superseded"] += 1
+                self.pending -= 1
+            if s["running"]:
+                if not s["running"]["cancel"].is_set(): self.counts["superseded"] += 1
+                s["running"]["cancel"].set()
+                s["waiting"] = job
+                self.pending += 1
+            else:
+                self._start(sid, s, job)
+            return True
+
+    def _start(self, sid, s, job):
+        s["running"] = job
+        self.pending += 1
+        self.pool.submit(self._run, sid, job)
+
+    def _run(self, sid, job):
+        def check():
+            if job["cancel"].is_set(): raise BuildCancelled()
+        with self.lock:
+            self.pending -= 1
+            self.active += 1
+        start = time.monotonic()
+        result = error = None
+        try:
+            check()
+            result = job["fn"](check)
+        except BuildCancelled:
+            pass
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        duration = time.monotonic() - start
+        with self.lock:
+            self.active -= 1
+            s = self.sessions.get(sid)
+            if error:
+                self.counts["failed"] += 1
+                if s is not None and not s["waiting"]: s["error"] = error
+            elif result is not None and not job["cancel"].is_set():
+                self.counts["completed"] += 1
+                self.durations.append(duration)
+                if s is not None: s["last"] = {"data": result, "key": job["key"], "finished": time.time(), "duration": duration, "wait": start - job["queued"]}
+            if s is not None:
+                s["running"] = None
+                if s["waiting"]:
+                    nxt, s["waiting"] = s["waiting"], None
+                    self.pending -= 1
+                    self._start(sid, s, nxt)
+
+    def status(self, sid):
+        with self.lock:
+            s = self.sessions.get(sid)
+            if not s: return {"last": None, "building": False, "error": None}
+            return {"last": s["last"], "building": bool(s["running"] or s["waiting"]), "error": s["error"]}
+
+    def stats(self):
+        with self.lock:
+            durations = sorted(self.durations)
+            out = {"workers": self.workers, "queue_depth": self.pending, "running": self.active, "sessions": len(self.sessions), **self.counts}
+        for p in (50, 95):
+            out[f"p{p}_build_s"] = round(durations[min(len(durations) - 1, p * len(durations) // 100)], 3) if durations else None
+        return out
+
+
+BUILDS = BuildQueue()
+atexit.register(lambda: BUILDS.pool.shutdown(wait=False, cancel_futures=True))
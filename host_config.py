@@ -0,0 +1,102 @@
+"""Caching and compression configs for common static hosts, derived from the packaged file list.
+
+Content-hashed files (name.<10 hex>[-suffix].ext) are cached for a year as
+immutable; HTML revalidates on every visit; the manifest and data files get
+a short max-age; the service worker is never cached.
+"""
+import posixpath
+import re
+
+HASH_SUFFIX = r'\.[0-9a-f]{10}(?:-[\w-]+)?'
+HASHED = re.compile(HASH_SUFFIX + r'\.\w+$')
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+SHORT = "public, max-age=300, must-revalidate"
+NO_CACHE = "no-cache"
+SERVICE_WORKER = "service-worker.js"
+SHORT_FILES = ("manifest.json", "catalog.json", "sitemap.xml", "robots.txt")
+COMPRESSIBLE = "text/html text/css text/plain text/xml application/javascript application/json application/manifest+json image/svg+xml"
+# Cloudflare Pages accepts at most 100 rules in _headers.
+MAX_HEADER_RULES = 100
+CONFIG_FILES = ("_headers", "nginx-titan.conf", ".htaccess")
+
+
+def classify(files):
+    """Split the package into (immutable paths or dir/* patterns, html files, short-lived files)."""
+    files = [f for f in files if f not in CONFIG_FILES and not f.endswith("/")]
+    dirs = {}
+    for f in files:
+        d = posixpath.dirname(f)
+        if d: dirs.setdefault(d, []).append(f)
+    hashed_dirs = sorted(d for d, names in dirs.items() if all(HASHED.search(n) for n in names))
+    immutable = [f"{d}/*" for d in hashed_dirs] + sorted(f for f in files if HASHED.search(f) and posixpath.dirname(f) not in hashed_dirs)
+    html = sorted(f for f in files if f.endswith(".html"))
+    short = [f for f in SHORT_FILES if f in files]
+    return immutable, html, short
+
+
+def link_header(preconnect):
+    return ", ".join(f"<{origin}>; rel=preconnect" + ("; crossorigin" if cors else "") for origin, cors in preconnect)
+
+
+def render_headers(files, preconnect):
+    # Netlify and Cloudflare Pages merge every matching rule, so Cache-Control rules must never overlap.
+    immutable, html, short = classify(files)
+    out = ["# Netlify / Cloudflare Pages", "/*", "  X-Content-Type-Options: nosniff"]
+    if preconnect: out.append(f"  Link: {link_header(preconnect)}")
+    out += [f"/{SERVICE_WORKER}", f"  Cache-Control: {NO_CACHE}"]
+    for f in short: out += [f"/{f}", f"  Cache-Control: {SHORT}"]
+    for f in immutable: out += [f"/{f}", f"  Cache-Control: {IMMUTABLE}"]
+    rules = 2 + len(short) + len(immutable)
+    if rules + len(html) + 1 <= MAX_HEADER_RULES:
+        for f in ["/"] + [f"/{f}" for f in html]: out += [f, f"  Cache-Control: {REVALIDATE}"]
+    else:
+        out.append(f"# {len(html)} HTML pages exceed the rule limit; both hosts already serve HTML with \"{REVALIDATE}\".")
+    return "\n".join(out) + "\n"
+
+
+def render_nginx(files, preconnect):
+    immutable, html, short = classify(files)
+    link = f'\n    add_header Link "{link_header(preconnect)}" always;' if preconnect else ""
+    out = [
+        "# Include inside the server { } block that serves the unpacked site.",
+        "gzip on;",
+        "gzip_vary on;",
+        "gzip_comp_level 6;",
+        f"gzip_types {COMPRESSIBLE.replace('text/html ', '')};",
+        "",
+        f'location = /{SERVICE_WORKER} {{\n    add_header Cache-Control "{NO_CACHE}" always;\n}}',
+    ]
+    for f in short: out.append(f'location = /{f} {{\n    add_header Cache-Control "{SHORT}" always;\n}}')
+    for f in immutable:
+        match = f"^~ /{f[:-1]}" if f.endswith("/*") else f"= /{f}"
+        out.append(f'location {match} {{\n    add_header Cache-Control "{IMMUTABLE}" always;\n}}')
+    if html: out.append(f'location ~* (^/$|\\.html$) {{\n    add_header Cache-Control "{REVALIDATE}" always;{link}\n}}')
+    return "\n".join(out) + "\n"
+
+
+def render_htaccess(files, preconnect):
+    immutable, html, short = classify(files)
+    exts = sorted({posixpath.splitext(f)[1][1:] for f in files if HASHED.search(f)})
+    out = [
+        "AddType image/avif .avif",
+        "AddType image/webp .webp",
+        "<IfModule mod_deflate.c>",
+        f"    AddOutputFilterByType DEFLATE {COMPRESSIBLE}",
+        "</IfModule>",
+        "<IfModule mod_headers.c>",
+        '    <FilesMatch "\\.html$">',
+        f'        Header set Cache-Control "{REVALIDATE}"',
+    ]
+    if preconnect: out.append(f'        Header set Link "{link_header(preconnect)}"')
+    out += ["    </FilesMatch>", f'    <Files "{SERVICE_WORKER}">', f'        Header set Cache-Control "{NO_CACHE}"', "    </Files>"]
+    for f in short: out += [f'    <Files "{f}">', f'        Header set Cache-Control "{SHORT}"', "    </Files>"]
+    if exts: out += [f'    <FilesMatch "{HASH_SUFFIX}\\.({"|".join(exts)})$">', f'        Header set Cache-Control "{IMMUTABLE}"', "    </FilesMatch>"]
+    out.append("</IfModule>")
+    return "\n".join(out) + "\n"
+
+
+def render_host_configs(files, preconnect=()):
+    """files: package paths; preconnect: [(origin, crossorigin)]. Returns {config filename: text}."""
+    files = list(files)
+    return dict(zip(CONFIG_FILES, (render_headers(files, preconnect), render_nginx(files, preconnect), render_htaccess(files, preconnect))))
@@ -0,0 +1,153 @@
+"""Local image pipeline: resized WebP/AVIF variants, blur placeholders and PWA icons.
+
+Images are processed once per source hash (results stay in memory across
+Streamlit reruns and in the shared artifact store across sessions) and
+written under img/ with content-hashed names, so the files can be cached
+forever by the host.
+"""
+import base64
+import hashlib
+import io
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+from artifact_cache import ARTIFACTS
+
+WIDTHS = (320, 640, 960, 1280, 1600, 1920)
+ICON_SIZES = (192, 512)
+OG_WIDTH = 1200
+PLACEHOLDER_WIDTH = 16
+WEBP_QUALITY = 78
+AVIF_QUALITY = 55
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".avif", ".bmp", ".tif", ".tiff")
+PIPELINE_VERSION = "1"
+CACHE_SIZE = 64
+STEM_STRIP = re.compile(r'[^a-z0-9]+')
+# Server-side folder whose images may be referenced by path. Unset, only uploads are bundled: the
+# paths come from editor fields and from the Store CSV, which anyone who controls the sheet can edit.
+IMAGE_DIR = os.environ.get("TITAN_IMAGE_DIR")
+
+try:
+    HAS_AVIF = bool(features.check("avif"))
+except Exception:
+    HAS_AVIF = False
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def image_stem(ref):
+    base = os.path.splitext(os.path.basename(ref.split("?")[0]))[0]
+    return STEM_STRIP.sub("-", base.lower()).strip("-")[:40] or "image"
+
+
+def read_local_image(ref, uploads, image_dir=IMAGE_DIR):
+    """Return the bytes behind an uploaded file name or an image path inside image_dir, else None (remote URLs are left alone)."""
+    if not ref: return None
+    if ref in uploads: return uploads[ref]
+    if not image_dir: return None
+    path = ref[7:] if ref.startswith("file://") else ref
+    if re.match(r'^(?:[a-z][a-z0-9+.-]*:|//)', path, re.I) or not path.lower().endswith(IMAGE_EXTS): return None
+    root = os.path.realpath(image_dir)
+    # Relative paths resolve inside image_dir; symlinks and ../ are resolved before the containment check.
+    path = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path): return None
+    with open(path, "rb") as f: return f.read()
+
+
+def _encode(img, fmt, **opts):
+    buf = io.BytesIO()
+    img.save(buf, fmt, **opts)
+    return buf.getvalue()
+
+
+def _resize(img, width):
+    if width >= img.width: return img
+    return img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+
+
+def process_image(data, stem, icons=False):
+    """Return an asset dict: w, h, alpha, placeholder (data URI), variants {fmt: [(width, path)]}, og, icons {size: path}, files {path: bytes}."""
+    key = hashlib.sha256(data + f"|{PIPELINE_VERSION}|{stem}|{icons}|{HAS_AVIF}".encode()).hexdigest()
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    # Then the on-disk store, which other sessions and processes may have filled.
+    stored = ARTIFACTS.get_bundle("image", key)
+    if stored:
+        meta, files = stored
+        asset = dict(meta, files=files, icons={int(size): path for size, path in meta["icons"].items()})
+        return _remember(key, asset)
+    digest = key[:10]
+    img = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    img = img.convert("RGBA" if alpha else "RGB")
+    top = min(img.width, WIDTHS[-1])
+    widths = [w for w in WIDTHS if w < top] + [top]
+    asset = {"w": top, "h": max(1, round(img.height * top / img.width)), "alpha": alpha, "variants": {"webp": []}, "files": {}, "icons": {}}
+    if HAS_AVIF: asset["variants"]["avif"] = []
+    # Largest first, each step resized from the previous one.
+    src = img
+    for w in reversed(widths):
+        src = _resize(src, w)
+        path = f"img/{stem}.{digest}-{w}.webp"
+        asset["files"][path] = _encode(src, "WEBP", quality=WEBP_QUALITY, method=4)
+        asset["variants"]["webp"].insert(0, (w, path))
+        if HAS_AVIF:
+            path = f"img/{stem}.{digest}-{w}.avif"
+            asset["files"][path] = _encode(src, "AVIF", quality=AVIF_QUALITY)
+            asset["variants"]["avif"].insert(0, (w, path))
+    # Social crawlers still expect JPEG/PNG.
+    og = _resize(img, min(OG_WIDTH, img.width))
+    asset["og"] = f"img/{stem}.{digest}-og.{'png' if alpha else 'jpg'}"
+    asset["files"][asset["og"]] = _encode(og, "PNG", optimize=True) if alpha else _encode(og, "JPEG", quality=82, optimize=True, progressive=True)
+    tiny = _resize(img, PLACEHOLDER_WIDTH)
+    asset["placeholder"] = "data:image/webp;base64," + base64.b64encode(_encode(tiny, "WEBP", quality=40)).decode()
+    if icons:
+        for size in ICON_SIZES:
+            path = f"img/{stem}.{digest}-icon-{size}.png"
+            asset["files"][path] = _encode(ImageOps.pad(img.convert("RGBA"), (size, size), Image.LANCZOS, color=(0, 0, 0, 0)), "PNG", optimize=True)
+            asset["icons"][size] = path
+    ARTIFACTS.put_bundle("image", key, {k: v for k, v in asset.items() if k != "files"}, asset["files"])
+    return _remember(key, asset)
+
+
+def _remember(key, asset):
+    with _lock:
+        _cache[key] = asset
+        while len(_cache) > CACHE_SIZE: _cache.popitem(last=False)
+    return asset
+
+
+def process_images(jobs, workers=None):
+    """jobs: {ref: (data, stem, icons)} -> ({ref: asset}, {ref: error}). Pillow releases the GIL while resizing and encoding, so threads suffice."""
+    def run(ref):
+        try: return ref, process_image(*jobs[ref]), None
+        except Exception as e: return ref, None, str(e) or type(e).__name__
+    refs = list(jobs)
+    workers = workers or min(8, os.cpu_count() or 1, len(refs) or 1)
+    if workers < 2: results = [run(ref) for ref in refs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool: results = list(pool.map(run, refs))
+    return {ref: a for ref, a, _ in results if a}, {ref: err for ref, _, err in results if err}
+
+
+def pick_variant(asset, width, fmt="webp"):
+    variants = asset["variants"][fmt]
+    return next((path for w, path in variants if w >= width), variants[-1][1])
+
+
+def srcset(asset, fmt="webp"):
+    return ", ".join(f"{path} {w}w" for w, path in asset["variants"][fmt])
+
+
+def data_uri(asset, path):
+    ext = path.rsplit(".", 1)[1]
+    mime = {"jpg": "image/jpeg"}.get(ext, f"image/{ext}")
+    return f"data:{mime};base64,{base64.b64encode(asset['files'][path]).decode()}"
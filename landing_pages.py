@@ -0,0 +1,85 @@
+"""Programmatic landing pages: one page per row of a locations/services CSV.
+
+The compiler renders a single page shell with lp_token() markers; rows are
+filled into it here. The shell is split once per batch and each page is a
+join of its literal parts with the row's values. That is cheaper than
+shipping the rendered pages back from a process pool, so rows render in
+the calling process.
+"""
+import csv
+import html
+import io
+import json
+import re
+import secrets
+
+# Markers carry a per-process nonce, so {{lp_...}} text typed into the site content is never substituted.
+LP_NONCE = secrets.token_hex(8)
+LP_TOKEN = re.compile(r'\{\{lp_' + LP_NONCE + r'_(\w+)\}\}')
+LP_FIELDS = ("title", "headline", "description", "intro", "location", "slug", "schema")
+SLUG_STRIP = re.compile(r'[^a-z0-9]+')
+COLUMN_ALIASES = {"city_or_area": "location", "area": "location", "service": "location", "name": "location", "zip": "postal_code", "postcode": "postal_code", "state": "region", "address": "street", "meta_description": "description"}
+RESERVED = {"index", "about", "contact", "privacy", "terms", "booking", "product", "blog", "post", "locations"}
+
+
+def lp_token(name):
+    if name not in LP_FIELDS: raise ValueError(f"unknown landing page field: {name}")
+    return "{{lp_" + LP_NONCE + "_" + name + "}}"
+
+
+def slugify(text):
+    return SLUG_STRIP.sub("-", text.lower()).strip("-") or "location"
+
+
+def parse_locations(csv_text):
+    # Header row required; "location" is the only mandatory column. Slugs are made unique and kept clear of core pages.
+    reader = csv.DictReader(io.StringIO(csv_text.lstrip("\ufeff")))
+    rows, seen = [], set()
+    for raw in reader:
+        row = {}
+        for k, v in raw.items():
+            if not k: continue
+            key = k.strip().lower().replace(" ", "_")
+            row[COLUMN_ALIASES.get(key, key)] = (v or "").strip()
+        if not row.get("location"): continue
+        slug = base = slugify(row.get("slug") or row["location"])
+        n = 2
+        while slug in seen or slug in RESERVED:
+            slug, n = f"{base}-{n}", n + 1
+        seen.add(slug)
+        row["slug"] = slug
+        rows.append(row)
+    return rows
+
+
+def landing_values(row, ctx):
+    loc = row["location"]
+    headline = row.get("headline") or f"{ctx['biz_name']} in {loc}"
+    description = row.get("description") or f"{ctx['seo_d']} Serving {loc}."
+    schema = dict(ctx["schema"], url=f"{ctx['base_url']}/{row['slug']}.html", areaServed=loc, description=description)
+    if row.get("phone"): schema["telephone"] = row["phone"]
+    address = {k: row[f] for k, f in (("streetAddress", "street"), ("addressLocality", "city"), ("addressRegion", "region"), ("postalCode", "postal_code"), ("addressCountry", "country")) if row.get(f)}
+    if address: schema["address"] = {"@type": "PostalAddress", **address}
+    schema_json = json.dumps(schema).replace("</", "<\\/")
+    return {
+        "title": html.escape(headline),
+        "headline": html.escape(headline),
+        "description": html.escape(description),
+        "intro": html.escape(row.get("intro") or description),
+        "location": html.escape(loc),
+        "slug": row["slug"],
+        "schema": f'<script type="application/ld+json">{schema_json}</script>',
+    }
+
+
+def render_page(parts, values):
+    out = parts[:]
+    out[1::2] = [values[name] for name in parts[1::2]]
+    return "".join(out)
+
+
+def render_landing_pages(shell, rows, ctx):
+    """Return [(filename, html)] in row order. ctx holds biz_name, seo_d, base_url and the base schema dict."""
+    # Literal text at even indexes, field names at odd ones.
+    parts = LP_TOKEN.split(shell)
+    return [(f"{row['slug']}.html", render_page(parts, landing_values(row, ctx))) for row in rows]
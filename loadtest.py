@@ -0,0 +1,394 @@
+"""Synthetic Store/Blog/translation datasets and a headless load test for compiled Titan sites.
+
+  python loadtest.py generate --store 10000 --blog 2000 --lang 500 --out data/
+  python loadtest.py run --site titan_site.zip --store 100,1000,10000 --blog 100,2000 --lang 500
+
+Compile the site with the Store, Blog and Translation CSV URLs this tool
+prints (http://127.0.0.1:8790/data/*.csv by default), with "Snapshot catalog
+at build time" off. `run` serves the package and the datasets from the same
+origin, opens a bench page in headless Chrome/Chromium and records per page
+and dataset size: CSV fetch time, CSV parse time, time until the content is
+in the DOM and painted, and DOM size. `serve` does the same without the
+bench, for poking at a large dataset by hand.
+"""
+import argparse
+import csv
+import functools
+import io
+import json
+import mimetypes
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+from rum_collector import percentile
+
+STORE_HEADER = ["Name", "Price", "Description", "Images", "Stripe Link", "3D Model", "Category", "Stock"]
+BLOG_HEADER = ["Slug", "Title", "Date", "Category", "Summary", "Image", "Content"]
+# Column order matches switchLang(code, column) in the generated language modal.
+LANG_CODES = ("es", "fr", "de", "hi", "bn")
+LANG_HEADER = ["Element ID", "Spanish", "French", "German", "Hindi", "Bengali"]
+LANG_IDS = ("hero-title", "hero-sub", "about-title", "feature-title", "store-title", "faq-title", "footer-home", "footer-blog", "footer-book")
+DATA_PATHS = {"store": "/data/store.csv", "blog": "/data/blog.csv", "lang": "/data/lang.csv"}
+# Dataset size served for the kinds a case is not measuring (the home page loads the store and the translations together).
+BACKGROUND_ROWS = 50
+DEFAULT_PORT = 8790
+CASE_TIMEOUT_MS = 30_000
+
+ADJECTIVES = ["Classic", "Modern", "Rustic", "Compact", "Deluxe", "Eco", "Urban", "Vintage", "Premium", "Everyday", "Nordic", "Handmade"]
+MATERIALS = ["Oak", "Walnut", "Linen", "Leather", "Steel", "Ceramic", "Bamboo", "Cotton", "Glass", "Brass", "Wool", "Marble"]
+PRODUCTS = ["Chair", "Lamp", "Desk", "Backpack", "Mug", "Watch", "Speaker", "Vase", "Throw", "Shelf", "Planter", "Headphones"]
+CATEGORIES = ["Furniture", "Lighting", "Bags", "Kitchen", "Accessories", "Audio", "Decor", "Outdoor"]
+STOCK = ["12", "3", "48", "in stock", "25", "0", "sold out", "7"]
+TOPICS = ["Pricing", "Hiring", "SEO", "Branding", "Customer Support", "Cash Flow", "Social Media", "Logistics"]
+AUDIENCES = ["Small Shops", "Agencies", "Founders", "Local Clinics", "Restaurants", "Freelancers"]
+WORDS = {
+    "es": "nuevo tienda precio oferta envío calidad hogar diseño cliente rápido".split(),
+    "fr": "nouveau boutique prix offre livraison qualité maison design client rapide".split(),
+    "de": "neu Laden Preis Angebot Versand Qualität Zuhause Design Kunde schnell".split(),
+    "hi": "नया दुकान कीमत ऑफ़र डिलीवरी गुणवत्ता घर डिज़ाइन ग्राहक तेज़".split(),
+    "bn": "নতুন দোকান দাম অফার ডেলিভারি মান বাড়ি নকশা গ্রাহক দ্রুত".split(),
+}
+
+
+def slug(text):
+    return "-".join("".join(ch if ch.isalnum() else " " for ch in text.lower()).split())
+
+
+def store_rows(n, seed=0):
+    rnd = random.Random(f"store-{seed}")
+    for i in range(n):
+        noun = rnd.choice(PRODUCTS)
+        name = f"{rnd.choice(ADJECTIVES)} {rnd.choice(MATERIALS)} {noun} #{i + 1}"
+        amount, roll = rnd.lognormvariate(3.8, 1.0), rnd.random()
+        # Mostly dollar prices with thousands separators (quoted in the CSV), some rupees and a few unpriced rows.
+        price = "Call for price" if roll < 0.03 else f"₹{int(amount * 83):,}" if roll < 0.2 else f"${int(amount):,}.{rnd.choice((0, 49, 95, 99)):02d}"
+        desc = f'{rnd.choice(ADJECTIVES)} {noun.lower()} in {rnd.choice(MATERIALS).lower()}, built to last. Ships in {rnd.randint(1, 9)} days; "{rnd.choice(CATEGORIES)}" favourite.'
+        images = "|".join(f"/data/img/{slug(noun)}-{i}-{k}.svg" for k in range(rnd.randint(1, 4)))
+        stripe = f"https://buy.stripe.com/test_{rnd.getrandbits(64):016x}" if rnd.random() < 0.35 else ""
+        model = f"/data/models/{slug(noun)}-{i}.glb" if rnd.random() < 0.1 else ""
+        yield [name, price, desc, images, stripe, model, rnd.choice(CATEGORIES), rnd.choice(STOCK)]
+
+
+def blog_rows(n, seed=0):
+    rnd = random.Random(f"blog-{seed}")
+    day = time.mktime((2026, 1, 1, 0, 0, 0, 0, 0, -1))
+    for i in range(n):
+        topic, audience = rnd.choice(TOPICS), rnd.choice(AUDIENCES)
+        title = f"{rnd.randint(3, 15)} {topic} Lessons for {audience}"
+        blocks = [f"## Why {topic.lower()} matters", f"Most {audience.lower()} get **{topic.lower()}** wrong, and it shows in the numbers."]
+        blocks += [f"- {rnd.choice(ADJECTIVES)} tip number {k + 1}, tested with real customers" for k in range(rnd.randint(2, 6))]
+        blocks += ["Read the [full checklist](contact.html) or book a call. " * rnd.randint(1, 4) for _ in range(rnd.randint(2, 8))]
+        # parseMarkdown() splits blocks on \r as well; a lone \r keeps each post on one CSV line, which the page's line splitter needs.
+        yield [f"{slug(title)}-{i + 1}", title, time.strftime("%Y-%m-%d", time.gmtime(day - i * 86400)), topic, f"What {audience.lower()} can learn about {topic.lower()}, in {rnd.randint(3, 12)} minutes.", f"/data/img/post-{i}.svg", "\r".join(blocks)]
+
+
+def lang_rows(n, seed=0):
+    rnd = random.Random(f"lang-{seed}")
+    ids = list(LANG_IDS[:n]) + [f"t-{i:05d}" for i in range(max(0, n - len(LANG_IDS)))]
+    for key in ids:
+        yield [key] + [" ".join(rnd.choice(WORDS[code]) for _ in range(rnd.randint(2, 7))) for code in LANG_CODES]
+
+
+GENERATORS = {"store": (STORE_HEADER, store_rows), "blog": (BLOG_HEADER, blog_rows), "lang": (LANG_HEADER, lang_rows)}
+
+
+@functools.lru_cache(maxsize=32)
+def dataset(kind, n, seed=0):
+    """CSV bytes for `n` synthetic rows of the given kind."""
+    header, rows = GENERATORS[kind]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows(n, seed))
+    return buf.getvalue().encode()
+
+
+@functools.lru_cache(maxsize=32)
+def last_key(kind, n, seed=0):
+    # The last row is the worst case for the product and post pages, which scan the sheet in order.
+    key = None
+    for row in GENERATORS[kind][1](n, seed): key = row[0]
+    return key
+
+
+def placeholder_svg(name):
+    hue = sum(name.encode()) % 360
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="640" height="480" viewBox="0 0 640 480"><rect width="640" height="480" fill="hsl({hue},45%,70%)"/><text x="320" y="250" font-size="28" text-anchor="middle" fill="#fff">{name[:40]}</text></svg>'.encode()
+
+
+# Injected after <head> in served pages; inert unless the page was opened by the bench (window.name carries the case).
+PROBE_JS = """(function() {
+    if (window.name.indexOf('titan-bench:') !== 0) return;
+    var c = JSON.parse(window.name.slice(12)), t = { catalog_parse: 0, csv_lines: 0 }, sent = false, ready = null;
+    function wrap(name, key) { var f = window[name]; if (typeof f !== 'function') return; window[name] = function() { var s = performance.now(); try { return f.apply(this, arguments); } finally { t[key] += performance.now() - s; } }; }
+    function report(m) { m.id = c.id; fetch('/__result', { method: 'POST', body: JSON.stringify(m), keepalive: true }).finally(function() { parent.postMessage('titan-bench-done', '*'); }); }
+    function check() {
+        if (ready !== null || !(c.lang ? document.documentElement.lang === c.lang : document.querySelector(c.ready))) return;
+        ready = performance.now();
+        requestAnimationFrame(function() { setTimeout(function() {
+            if (sent) return; sent = true;
+            var res = performance.getEntriesByType('resource').filter(function(e) { return e.name.indexOf(c.csv) >= 0; })[0];
+            report({ ready_ms: ready, painted_ms: performance.now(), fetch_ms: res ? res.responseEnd - res.startTime : null, csv_kb: res ? res.encodedBodySize / 1024 : null,
+                     catalog_parse_ms: t.catalog_parse, csv_lines_ms: t.csv_lines, dom_nodes: document.getElementsByTagName('*').length,
+                     heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null });
+        }, 0); });
+    }
+    document.addEventListener('DOMContentLoaded', function() {
+        wrap('buildCatalog', 'catalog_parse'); wrap('parseCSVLine', 'csv_lines');
+        new MutationObserver(check).observe(document.documentElement, { childList: true, subtree: true, attributes: true, attributeFilter: ['lang'] });
+        check();
+    });
+    setTimeout(function() { if (!sent) { sent = true; report({ error: 'timeout' }); } }, c.timeout);
+})();"""
+
+BENCH_HTML = """<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Titan load test</title></head><body style="margin:0; font-family:monospace;"><pre id="log"></pre><script>
+async function run() {
+    const log = document.getElementById('log');
+    for (;;) {
+        const c = await (await fetch('/__next', { cache: 'no-store' })).json();
+        if (c.done) { log.textContent += 'done\\n'; return; }
+        localStorage.clear(); sessionStorage.clear(); localStorage.setItem('popupShown', 'true');
+        if (c.lang) { localStorage.setItem('titan_lang', c.lang); localStorage.setItem('titan_col', c.col); }
+        await new Promise(resolve => {
+            const f = document.createElement('iframe'); let timer = null;
+            const finish = e => { if (e && e.data !== 'titan-bench-done') return; removeEventListener('message', finish); clearTimeout(timer); f.remove(); resolve(); };
+            // Pages that never load the probe (404, script error before <head>) still get a result row.
+            timer = setTimeout(() => fetch('/__result', { method: 'POST', body: JSON.stringify({ id: c.id, error: 'no probe' }) }).finally(() => finish()), c.timeout + 5000);
+            addEventListener('message', finish);
+            f.name = 'titan-bench:' + JSON.stringify(c); f.width = 1280; f.height = 800; f.src = c.url;
+            document.body.appendChild(f);
+        });
+        log.textContent += c.page + ' ' + c.rows + ' #' + c.repeat + '\\n';
+    }
+}
+run();
+</script></body></html>"""
+
+
+class Site:
+    """Read-only view of a compiled package, either the downloaded ZIP or an unpacked directory."""
+    def __init__(self, path):
+        self.path = path
+        self.zip = zipfile.ZipFile(path) if zipfile.is_zipfile(path) else None
+
+    def read(self, name):
+        name = name.lstrip("/") or "index.html"
+        if self.zip:
+            try: return self.zip.read(name)
+            except KeyError: return None
+        full = os.path.realpath(os.path.join(self.path, name))
+        if not full.startswith(os.path.realpath(self.path) + os.sep) or not os.path.isfile(full): return None
+        with open(full, "rb") as f: return f.read()
+
+
+class Bench:
+    def __init__(self, site, cases=(), sizes=None, timeout=CASE_TIMEOUT_MS):
+        self.site = site
+        self.timeout = timeout
+        self.sizes = dict(sizes or {k: BACKGROUND_ROWS for k in DATA_PATHS})
+        self.plan = deque(cases)
+        self.cases = {}
+        self.results = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        if not self.plan: self.done.set()
+
+    def next_case(self):
+        with self.lock:
+            if not self.plan: return {"done": True}
+            case = self.plan.popleft()
+            self.sizes = {k: BACKGROUND_ROWS for k in DATA_PATHS}
+            self.sizes[case["kind"]] = case["rows"]
+            self.cases[case["id"]] = case
+            return dict(case, timeout=self.timeout)
+
+    def add_result(self, result):
+        with self.lock:
+            case = self.cases.pop(result.get("id"), None)
+            if case is None: return
+            self.results.append(dict(case, **result))
+            print(f"  {case['page']:<8} {case['rows']:>7} rows  #{case['repeat']}  " + (result["error"] if "error" in result else f"ready {result['ready_ms']:.0f} ms"), flush=True)
+            if not self.plan and not self.cases: self.done.set()
+
+
+def make_handler(bench):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body=b"", ctype="application/json"):
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            # Every case must measure a cold fetch and parse.
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if urlparse(self.path).path != "/__result" or not 0 < length <= 65_536: return self._send(400)
+            try: result = json.loads(self.rfile.read(length))
+            except ValueError: return self._send(400)
+            if isinstance(result, dict): bench.add_result(result)
+            self._send(204)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            path, query = url.path, parse_qs(url.query)
+            if path == "/__bench": return self._send(200, BENCH_HTML.encode(), "text/html; charset=utf-8")
+            if path == "/__next": return self._send(200, json.dumps(bench.next_case()).encode())
+            for kind, data_path in DATA_PATHS.items():
+                if path == data_path:
+                    n = int(query["n"][0]) if query.get("n", [""])[0].isdigit() else bench.sizes[kind]
+                    return self._send(200, dataset(kind, n), "text/csv; charset=utf-8")
+            if path.startswith("/data/img/"): return self._send(200, placeholder_svg(os.path.basename(path)), "image/svg+xml")
+            # A service worker would serve cached pages and a catalog snapshot would bypass the sheet; neither belongs in a measurement.
+            if path in ("/service-worker.js", "/catalog.json"): return self._send(404)
+            body = bench.site.read(path) if bench.site else None
+            if body is None: return self._send(404)
+            ctype = mimetypes.guess_type(path if "." in path.rsplit("/", 1)[-1] else "index.html")[0] or "application/octet-stream"
+            if ctype == "text/html":
+                body = body.replace(b"<head>", b"<head><script>" + PROBE_JS.encode() + b"</script>", 1)
+                ctype += "; charset=utf-8"
+            self._send(200, body, ctype)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def build_cases(store, blog, lang, repeat):
+    cases = []
+    for kind, pages, sizes in (("store", ("store", "product"), store), ("blog", ("blog", "post"), blog), ("lang", ("lang",), lang)):
+        for n in sizes:
+            for page in pages:
+                if page == "store": url, ready = "/index.html", "#inv-grid .card"
+                elif page == "product": url, ready = f"/product.html?item={quote(last_key(kind, n))}", "#product-detail .detail-view"
+                elif page == "blog": url, ready = "/blog.html", "#blog-grid article"
+                elif page == "post": url, ready = f"/post.html?id={quote(last_key(kind, n))}", "#post-container header"
+                else: url, ready = "/index.html", None
+                for r in range(repeat):
+                    case = {"id": len(cases), "page": page, "kind": kind, "rows": n, "repeat": r + 1, "url": url, "ready": ready, "csv": DATA_PATHS[kind]}
+                    if page == "lang": case.update(lang=LANG_CODES[0], col=1)
+                    cases.append(case)
+    return cases
+
+
+def summarize(results):
+    groups = {}
+    for r in results: groups.setdefault((r["page"], r["rows"]), []).append(r)
+    metrics = ("fetch_ms", "catalog_parse_ms", "csv_lines_ms", "ready_ms", "painted_ms", "dom_nodes")
+    lines = [f"{'page':<8} {'rows':>7} {'ok':>5} " + "  ".join(f"{m + ' p50':>19}" for m in metrics)]
+    for (page, rows), runs in groups.items():
+        ok = [r for r in runs if "error" not in r]
+        cells = []
+        for m in metrics:
+            values = sorted(r[m] for r in ok if r.get(m) is not None)
+            cells.append(f"{percentile(values, 50):>19.1f}" if values else f"{'-':>19}")
+        lines.append(f"{page:<8} {rows:>7} {len(ok):>2}/{len(runs):<2} " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+BROWSERS = ("chrome-headless-shell", "chromium", "chromium-browser", "google-chrome", "google-chrome-stable", "chrome", "microsoft-edge", "msedge")
+
+
+def find_browser(choice):
+    if choice == "none": return None
+    if choice != "auto": return choice
+    return next((p for p in map(shutil.which, BROWSERS) if p), None)
+
+
+def sizes_arg(text):
+    return [int(x) for x in text.split(",") if x.strip()] if text else []
+
+
+def print_urls(host, port):
+    print("Compile the site with these data sources:")
+    for label, kind in (("Store CSV", "store"), ("Blog CSV", "blog"), ("Translation Sheet CSV URL", "lang")):
+        print(f"  {label:<26} http://{host}:{port}{DATA_PATHS[kind]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic datasets and headless load tests for compiled Titan sites.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="Write synthetic store.csv, blog.csv and lang.csv.")
+    gen.add_argument("--store", type=int, default=1000)
+    gen.add_argument("--blog", type=int, default=200)
+    gen.add_argument("--lang", type=int, default=100)
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--out", default=".")
+    for name, help_text in (("serve", "Serve a compiled package and fixed-size datasets for manual testing."), ("run", "Load-test a compiled package across dataset sizes.")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--site", required=True, help="Downloaded package ZIP or unpacked directory.")
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve, run = sub.choices["serve"], sub.choices["run"]
+    serve.add_argument("--store", type=int, default=1000)
+    serve.add_argument("--blog", type=int, default=200)
+    serve.add_argument("--lang", type=int, default=100)
+    run.add_argument("--store", default="100,1000,10000", help="Comma-separated row counts (empty to skip).")
+    run.add_argument("--blog", default="100,500,2000")
+    run.add_argument("--lang", default="100,1000")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--timeout", type=int, default=CASE_TIMEOUT_MS, help="Per page, in milliseconds.")
+    run.add_argument("--browser", default="auto", help='Chrome/Chromium binary, "auto" to search PATH, or "none" to open the bench URL yourself.')
+    run.add_argument("--json", help="Write every result row to this file.")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        os.makedirs(args.out, exist_ok=True)
+        for kind, n in (("store", args.store), ("blog", args.blog), ("lang", args.lang)):
+            path = os.path.join(args.out, f"{kind}.csv")
+            with open(path, "wb") as f: f.write(dataset(kind, n, args.seed))
+            print(f"{path}: {n} rows, {os.path.getsize(path) / 1024:.0f} KB")
+        return
+
+    site = Site(args.site)
+    if args.command == "serve":
+        bench = Bench(site, sizes={"store": args.store, "blog": args.blog, "lang": args.lang})
+    else:
+        bench = Bench(site, build_cases(sizes_arg(args.store), sizes_arg(args.blog), sizes_arg(args.lang), args.repeat), timeout=args.timeout)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(bench))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print_urls(args.host, args.port)
+    if args.command == "serve":
+        print(f"Site on http://{args.host}:{args.port}/index.html")
+        try:
+            while True: time.sleep(3600)
+        except KeyboardInterrupt: return
+
+    url = f"http://{args.host}:{args.port}/__bench"
+    browser, proc, profile = find_browser(args.browser), None, tempfile.mkdtemp(prefix="titan-bench-")
+    if browser:
+        flags = ["--headless=new", "--disable-gpu", "--no-first-run", "--no-default-browser-check", "--disable-extensions", f"--user-data-dir={profile}", "--window-size=1280,800"]
+        if hasattr(os, "geteuid") and os.geteuid() == 0: flags.append("--no-sandbox")
+        proc = subprocess.Popen([browser, *flags, url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(f"Running {len(bench.plan)} cases in {os.path.basename(browser)} (headless)")
+    else:
+        print(f"No browser found; open {url} to run {len(bench.plan)} cases")
+    try:
+        while not bench.done.wait(1):
+            if proc and proc.poll() is not None:
+                print(f"Browser exited with code {proc.returncode}")
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if proc and proc.poll() is None: proc.terminate()
+        server.shutdown()
+        shutil.rmtree(profile, ignore_errors=True)
+    print(summarize(bench.results))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(bench.results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""The small markdown dialect used for page copy: headings, lists, **bold** and safe links.
+
+format_text() renders it at build time; parseMarkdown() in MARKDOWN_JS renders
+blog posts from the live sheet in the browser. Both must produce the same
+HTML, so the Python side spells out the JavaScript semantics it would
+otherwise differ on: lines break on \\r\\n, \\n or \\r only, whitespace is
+the set String.prototype.trim() and \\s use, \\w and \\d are ASCII and . also
+matches U+2028/U+2029. tests/test_markdown_lite.py runs both on the same input.
+"""
+import functools
+import re
+
+# JavaScript's WhiteSpace and LineTerminator code points.
+MD_SPACE = "\t\n\v\f\r \xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000\ufeff"
+MD_LINES = re.compile(r'\r\n|\n|\r')
+MD_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+MD_BLOCK = re.compile(r'(?:(#{1,6})|([*-])|(\d+)[.)])[' + MD_SPACE + r']+(.*)', re.ASCII | re.DOTALL)
+MD_INLINE = re.compile(r'\*\*(.+?)\*\*|\[([^\]]+)\]\(([^)' + MD_SPACE + r']+)\)', re.ASCII | re.DOTALL)
+MD_SAFE_URL = re.compile(r'(?:https?:|mailto:|tel:|#|/|\./|[\w-]+\.html)', re.ASCII | re.I)
+MD_P = "<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>"
+MD_LI = '<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">'
+MD_LIST_OPEN = {"ul": '<ul style="margin-bottom:1rem; padding-left:1.5rem;">', "ol": '<ol style="margin-bottom:1rem; padding-left:1.5rem;">'}
+
+
+def md_inline(text):
+    return MD_INLINE.sub(md_inline_sub, text)
+
+
+def md_inline_sub(m):
+    if m.group(1) is not None: return f"<strong>{md_inline(m.group(1))}</strong>"
+    label, href = m.group(2), m.group(3)
+    return f'<a href="{href}">{label}</a>' if MD_SAFE_URL.match(href) else label
+
+
+# Single pass over lines; output is collected in a list and joined once.
+# lru_cache rather than st.cache_data: package builds call this from BUILDS worker threads, which have no ScriptRunContext.
+@functools.lru_cache(maxsize=256)
+def format_text(text):
+    if not text: return ""
+    out, list_tag = [], None
+    for line in MD_LINES.split(text):
+        line = line.strip(MD_SPACE)
+        if not line: continue
+        m = MD_BLOCK.match(line)
+        tag = None if not m or m.group(1) else ("ul" if m.group(2) else "ol")
+        if tag != list_tag:
+            if list_tag: out.append(f"</{list_tag}>")
+            if tag: out.append(MD_LIST_OPEN[tag])
+            list_tag = tag
+        if not m:
+            out.append(f"{MD_P}{md_inline(line.translate(MD_ESCAPE))}</p>")
+        elif tag:
+            out.append(f"{MD_LI}{md_inline(m.group(4).translate(MD_ESCAPE))}</li>")
+        else:
+            level = len(m.group(1))
+            out.append(f"<h{level}>{md_inline(m.group(4).translate(MD_ESCAPE))}</h{level}>")
+    if list_tag: out.append(f"</{list_tag}>")
+    return "".join(out)
+
+
+MARKDOWN_JS = r"""
+    var MD_ESC = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'};
+    var MD_BLOCK = /^(?:(#{1,6})|([*-])|(\d+)[.)])\s+(.*)/s;
+    var MD_INLINE = /\*\*(.+?)\*\*|\[([^\]]+)\]\(([^)\s]+)\)/gs;
+    var MD_SAFE_URL = /^(?:https?:|mailto:|tel:|#|\/|\.\/|[\w-]+\.html)/i;
+    var MD_P = "<p style='margin-bottom:1rem; opacity:0.9; color:inherit;'>";
+    var MD_LI = '<li style="margin-bottom:0.5rem; opacity:0.9; color:inherit;">';
+    function mdInline(s) { return s.replace(MD_INLINE, (m, b, label, href) => b !== undefined ? '<strong>' + mdInline(b) + '</strong>' : (MD_SAFE_URL.test(href) ? '<a href="' + href + '">' + label + '</a>' : label)); }
+    function mdEsc(s) { return s.replace(/[&<>"']/g, ch => MD_ESC[ch]); }
+    function parseMarkdown(text) {
+        if (!text) return '';
+        const out = []; let listTag = null;
+        for (let line of text.split(/\r\n|\n|\r/)) {
+            line = line.trim(); if (!line) continue;
+            const m = line.match(MD_BLOCK);
+            const tag = !m || m[1] ? null : (m[2] ? 'ul' : 'ol');
+            if (tag !== listTag) {
+                if (listTag) out.push('</' + listTag + '>');
+                if (tag) out.push('<' + tag + ' style="margin-bottom:1rem; padding-left:1.5rem;">');
+                listTag = tag;
+            }
+            if (!m) out.push(MD_P + mdInline(mdEsc(line)) + '</p>');
+            else if (tag) out.push(MD_LI + mdInline(mdEsc(m[4])) + '</li>');
+            else out.push('<h' + m[1].length + '>' + mdInline(mdEsc(m[4])) + '</h' + m[1].length + '>');
+        }
+        if (listTag) out.push('</' + listTag + '>');
+        return out.join('');
+    }
+"""
@@ -0,0 +1,84 @@
+"""In-memory ZIP writer whose deflated entries come from the shared artifact store.
+
+Deflating is the dominant cost of packaging a large site (thousands of
+landing pages), and most files are byte-identical from one build to the next.
+Each entry is compressed once per content hash: the raw deflate stream and its
+CRC are stored, and later builds copy them into the archive. An edit then only
+pays for rendering and hashing plus deflating the files it actually changed.
+
+The archive layout matches zipfile's output for the same entries; zipfile
+itself offers no way to add an entry that is already compressed.
+"""
+import hashlib
+import struct
+import time
+import zipfile
+import zlib
+
+from artifact_cache import ARTIFACTS
+
+# Below this size a store lookup costs more than compressing the entry again.
+CACHE_MIN = 4096
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+UTF8_FLAG = 0x800
+
+
+def deflate(data):
+    c = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush()
+
+
+class PackageZip:
+    """Drop-in for the writestr()/namelist() subset of zipfile.ZipFile used by build_package()."""
+
+    def __init__(self, store=ARTIFACTS):
+        self.store = store
+        self.parts = []
+        self.entries = []
+        self.offset = 0
+        t = time.localtime()
+        self.dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+        self.dos_date = (t.tm_year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _compress(self, data):
+        # Returns (crc, deflated); cached entries carry their CRC so a hit skips both passes over the data.
+        if len(data) < CACHE_MIN: return zlib.crc32(data), deflate(data)
+        key = hashlib.sha256(data).hexdigest()
+        blob = self.store.get("deflate", key)
+        if blob is None:
+            blob = zlib.crc32(data).to_bytes(4, "big") + deflate(data)
+            # Thousands of new entries on a cold build: write them behind the build instead of in it.
+            self.store.put_async("deflate", key, blob)
+        return int.from_bytes(blob[:4], "big"), blob[4:]
+
+    def writestr(self, name, data, compress_type=zipfile.ZIP_DEFLATED):
+        if isinstance(data, str): data = data.encode()
+        if compress_type == zipfile.ZIP_DEFLATED: crc, body = self._compress(data)
+        else: crc, body = zlib.crc32(data), data
+        if self.offset + len(body) > zipfile.ZIP64_LIMIT or len(self.entries) >= zipfile.ZIP_FILECOUNT_LIMIT:
+            raise zipfile.LargeZipFile("package needs ZIP64")
+        try: encoded, flags = name.encode("ascii"), 0
+        except UnicodeEncodeError: encoded, flags = name.encode(), UTF8_FLAG
+        header = LOCAL_HEADER.pack(b"PK\x03\x04", 20, 0, flags, compress_type, self.dos_time, self.dos_date, crc, len(body), len(data), len(encoded), 0)
+        self.entries.append((name, encoded, flags, compress_type, crc, len(body), len(data), self.offset))
+        self.parts += [header, encoded, body]
+        self.offset += len(header) + len(encoded) + len(body)
+
+    def namelist(self):
+        return [e[0] for e in self.entries]
+
+    def getvalue(self):
+        central = []
+        for _, encoded, flags, method, crc, csize, size, offset in self.entries:
+            central += [CENTRAL_HEADER.pack(b"PK\x01\x02", 20, 3, 20, 0, flags, method, self.dos_time, self.dos_date, crc, csize, size, len(encoded), 0, 0, 0, 0, 0o644 << 16, offset), encoded]
+        cd = b"".join(central)
+        end = END_RECORD.pack(b"PK\x05\x06", 0, 0, len(self.entries), len(self.entries), len(cd), self.offset, 0)
+        return b"".join(self.parts) + cd + end
@@ -0,0 +1,123 @@
+"""Local collector for the RUM beacons emitted by Titan sites.
+
+Run `python rum_collector.py --port 8787`, set "RUM Beacon Endpoint" to
+http://localhost:8787/rum in the compiler and open /stats for p50/p75/p95
+per site, page and metric (add ?by=variant to split by A/B variant).
+"""
+import argparse
+import json
+import math
+import threading
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_VIEWS = 200_000
+MAX_BODY = 16_384
+PERCENTILES = (50, 75, 95)
+
+
+class RumStore:
+    # Beacons are merged per page view, so a later batch (e.g. an updated CLS) replaces the earlier value.
+    def __init__(self, log_path=None, max_views=MAX_VIEWS):
+        self.views = OrderedDict()
+        self.max_views = max_views
+        self.log_path = log_path
+        self.lock = threading.Lock()
+
+    def add(self, beacon):
+        # Beacons come from any origin: labels are coerced to str so groups stay sortable, and json.loads
+        # accepts NaN/Infinity, which would corrupt the sorted percentiles (booleans are not timings either).
+        m = beacon.get("m")
+        if not isinstance(m, dict): return
+        metrics = {k: float(v) for k, v in m.items() if isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)}
+        if not metrics: return
+        vid = str(beacon.get("v") or id(beacon))
+        with self.lock:
+            view = self.views.pop(vid, None) or {"site": str(beacon.get("site") or "unknown"), "page": str(beacon.get("page") or "unknown"), "variant": str(beacon.get("variant") or "-"), "m": {}}
+            view["m"].update(metrics)
+            self.views[vid] = view
+            while len(self.views) > self.max_views: self.views.popitem(last=False)
+            if self.log_path:
+                with open(self.log_path, "a", encoding="utf-8") as f: f.write(json.dumps(beacon) + "\n")
+
+    def stats(self, by_variant=False):
+        groups = defaultdict(list)
+        with self.lock:
+            for view in self.views.values():
+                for metric, value in view["m"].items():
+                    groups[(view["site"], view["page"], view["variant"] if by_variant else "*", metric)].append(value)
+        out = defaultdict(lambda: defaultdict(dict))
+        for (site, page, variant, metric), values in sorted(groups.items()):
+            values.sort()
+            row = {"n": len(values)}
+            row.update({f"p{p}": percentile(values, p) for p in PERCENTILES})
+            key = page if variant == "*" else f"{page} [{variant}]"
+            out[site][key][metric] = row
+        return out
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile.
+    idx = max(0, min(len(sorted_values) - 1, -(-p * len(sorted_values) // 100) - 1))
+    return round(sorted_values[idx], 3)
+
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body=b"", ctype="application/json"):
+            self.send_response(code)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_OPTIONS(self):
+            self._send(204)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if urlparse(self.path).path != "/rum" or not 0 < length <= MAX_BODY: return self._send(400)
+            try: beacon = json.loads(self.rfile.read(length))
+            except ValueError: return self._send(400)
+            if isinstance(beacon, dict): store.add(beacon)
+            self._send(204)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/stats": return self._send(404)
+            by_variant = parse_qs(url.query).get("by") == ["variant"]
+            self._send(200, json.dumps(store.stats(by_variant), indent=2).encode())
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect and aggregate Titan RUM beacons.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--log", help="Append raw beacons to this JSONL file.")
+    args = parser.parse_args()
+    store = RumStore()
+    if args.log:
+        try:
+            with open(args.log, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip(): store.add(json.loads(line))
+        except FileNotFoundError:
+            pass
+        store.log_path = args.log
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    print(f"RUM collector on http://{args.host}:{args.port}/rum  (stats: /stats, /stats?by=variant)")
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Store catalog indexing: the rows, filter facets and sort orders behind the store grid.
+
+index_catalog() runs at build time when the catalog is snapshotted into
+catalog.json; buildCatalog() in CATALOG_JS does the same from the live sheet
+in the browser. Both must produce the same structure, which
+tests/test_store_catalog.py checks by running them on the same CSV.
+"""
+import pandas as pd
+
+CATALOG_COLS = ["name", "price_text", "desc", "images", "stripe", "model", "category", "stock"]
+OUT_OF_STOCK = r'(?i)(?:0|no|false|out of stock|out|sold out|sold)'
+
+
+def fmt_price(x):
+    return f"{x:.2f}".rstrip("0").rstrip(".")
+
+
+def index_catalog(source):
+    """Return (catalog, report) for a Store CSV path, URL or file object."""
+    # Rows are [name, price_text, price, desc, images, stripe, model, category, in_stock]; facets and sorts are row-index arrays.
+    # Only columns A-H are read: with fewer names than fields, pandas would turn the extra leading columns into the index.
+    cols = range(len(CATALOG_COLS))
+    df = pd.read_csv(source, header=None, skiprows=1, names=cols, usecols=cols, dtype=str, keep_default_na=False, on_bad_lines="skip")
+    df = df.fillna("").apply(lambda col: col.str.strip())
+    df.columns = CATALOG_COLS
+    df = df[df.name != ""]
+    dupes = sorted(df.name[df.name.duplicated()].unique())
+    df = df.drop_duplicates("name").reset_index(drop=True)
+    price = pd.to_numeric(df.price_text.str.replace(r"[^0-9.]", "", regex=True), errors="coerce")
+    in_stock = ~df.stock.str.fullmatch(OUT_OF_STOCK)
+
+    priced = price.dropna()
+    edges = sorted(set(priced.quantile([0.25, 0.5, 0.75], interpolation="lower"))) if len(priced) else []
+    buckets = pd.cut(price, [-float("inf"), *edges, float("inf")], labels=False) if edges else pd.Series(float("nan"), index=price.index)
+    price_facet = []
+    for k in range(len(edges) + 1):
+        ids = price.index[buckets == k]
+        if len(ids): price_facet.append([f"{fmt_price(price[ids].min())} – {fmt_price(price[ids].max())}", ids.tolist()])
+
+    rows = df.assign(price=price.astype(object).where(price.notna(), None), in_stock=in_stock.astype(int))[["name", "price_text", "price", "desc", "images", "stripe", "model", "category", "in_stock"]].values.tolist()
+    catalog = {
+        "rows": rows,
+        "facets": {
+            "category": {cat: ids.tolist() for cat, ids in df.groupby("category").indices.items() if cat},
+            "price": price_facet,
+            "stock": df.index[in_stock].tolist(),
+        },
+        "sort": {
+            "price_asc": price.sort_values(kind="stable", na_position="last").index.tolist(),
+            "price_desc": price.sort_values(ascending=False, kind="stable", na_position="last").index.tolist(),
+            "name": df.name.str.lower().sort_values(kind="stable").index.tolist(),
+        },
+    }
+    report = {"total": len(df), "dupes": dupes, "bad_price": int((price.isna() & (df.price_text != "")).sum())}
+    return catalog, report
+
+
+CSV_LINE_JS = r"""
+    function parseCSVLine(str) { 
+        const res = []; let cur = ''; let inQuote = false; 
+        for (let i = 0; i < str.length; i++) { 
+            const c = str[i]; 
+            if (c === '"') { if (inQuote && str[i+1] === '"') { cur += '"'; i++; } else { inQuote = !inQuote; } } 
+            else if (c === ',' && !inQuote) { res.push(cur.trim()); cur = ''; } 
+            else { cur += c; } 
+        } 
+        res.push(cur.trim()); return res; 
+    }
+"""
+
+CATALOG_JS = r"""
+    var CATALOG_OOS = /^(?:0|no|false|out of stock|out|sold out|sold)$/i;
+    function fmtPrice(x) { return x.toFixed(2).replace(/\.?0+$/, ''); }
+    function buildCatalog(lines) {
+        const rows = [], seen = new Set();
+        for (let i = 1; i < lines.length; i++) {
+            if (!lines[i].trim()) continue;
+            const c = parseCSVLine(lines[i]); if (!c[0] || seen.has(c[0])) continue; seen.add(c[0]);
+            const pt = c[1] || ''; const num = pt.replace(/[^0-9.]/g, '') === '' ? NaN : Number(pt.replace(/[^0-9.]/g, ''));
+            rows.push([c[0], pt, isNaN(num) ? null : num, c[2] || '', c[3] || '', c[4] || '', c[5] || '', c[6] || '', CATALOG_OOS.test(c[7] || '') ? 0 : 1]);
+        }
+        const category = {}, stock = [], priced = [];
+        rows.forEach((r, i) => { if (r[7]) (category[r[7]] = category[r[7]] || []).push(i); if (r[8]) stock.push(i); if (r[2] !== null) priced.push(i); });
+        const asc = [...priced].sort((a, b) => rows[a][2] - rows[b][2]), desc = [...priced].sort((a, b) => rows[b][2] - rows[a][2]);
+        const unpriced = rows.map((r, i) => i).filter(i => rows[i][2] === null);
+        const edges = asc.length ? [...new Set([0.25, 0.5, 0.75].map(q => rows[asc[Math.floor(q * (asc.length - 1))]][2]))].sort((a, b) => a - b) : [];
+        const buckets = edges.map(() => []).concat([[]]);
+        priced.forEach(i => buckets[edges.filter(e => e < rows[i][2]).length].push(i));
+        const price = buckets.filter(b => b.length).map(b => { const v = b.map(i => rows[i][2]); return [fmtPrice(Math.min(...v)) + ' – ' + fmtPrice(Math.max(...v)), b]; });
+        const lower = rows.map(r => r[0].toLowerCase());
+        const name = rows.map((r, i) => i).sort((a, b) => lower[a] < lower[b] ? -1 : lower[a] > lower[b] ? 1 : a - b);
+        return { rows, facets: { category, price, stock }, sort: { price_asc: asc.concat(unpriced), price_desc: desc.concat(unpriced), name } };
+    }
+"""
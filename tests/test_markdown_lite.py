@@ -0,0 +1,48 @@
+"""format_text() and the browser's parseMarkdown() must render the same HTML."""
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from markdown_lite import MARKDOWN_JS, format_text
+
+CASES = [
+    "",
+    "Plain paragraph",
+    "# Title\nIntro with **bold** and [a link](https://example.com).",
+    "- one\n- two\n1. first\n2) second\n\nAfter the list",
+    "mac\rline endings\r\n\rmixed",
+    "split\u2028here and\u2029there",
+    "tab\x0bvertical\x1cfile separator\x85next line",
+    "\xa0 padded \u3000",
+    "**café crème** and **日本語**",
+    "[café](café.html) [page](about.html) [x](javascript:alert(1))",
+    "**line\u2028break** stays one strong",
+    "#\xa0Heading after no-break space",
+    "٣. Arabic-Indic digit is not a list",
+    "<script>alert('x')</script> & \"quotes\"",
+]
+
+
+def parse_markdown_js(texts):
+    script = MARKDOWN_JS + "\nprocess.stdout.write(JSON.stringify(JSON.parse(require('fs').readFileSync(0, 'utf8')).map(parseMarkdown)));"
+    out = subprocess.run(["node", "-e", script], input=json.dumps(texts), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node is not installed")
+def test_python_and_js_render_the_same_html():
+    for text, js in zip(CASES, parse_markdown_js(CASES)):
+        assert format_text(text) == js, repr(text)
+
+
+def test_lines_break_like_javascript():
+    assert format_text("a\rb") == format_text("a\nb")
+    assert format_text("a\u2028b").count("<p") == 1
+    assert format_text("a\x1cb").count("<p") == 1
+
+
+def test_word_characters_are_ascii():
+    assert format_text("**über**").endswith("<strong>über</strong></p>")
+    assert "<a " not in format_text("[x](café.html)")
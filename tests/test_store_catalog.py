@@ -0,0 +1,38 @@
+"""index_catalog() and the browser's buildCatalog() must index a Store sheet the same way."""
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from store_catalog import CATALOG_JS, CSV_LINE_JS, index_catalog
+
+HEADER = "Name,Price,Description,Images,Stripe,Model,Category,Stock"
+CASES = {
+    "basic": HEADER + "\nHat,$ 12.50,Wool,,,,Hats,1\nMug,$ 8,Ceramic,,,,Kitchen,yes\nScarf,£15,Silk,,,,Hats,0\n",
+    "over_wide": HEADER + ",I,J,K,L,Notes\n" + "".join(f"Item {i},$ {i}.00,Thing {i},,,,Cat {i % 3},1,,,,,note {i}\n" for i in range(8)),
+    "ragged": HEADER + "\nShort,$ 5\nWide,$ 6,d,,,,Tools,sold out,x,y,z,1,2,3,4,5\n\nBare\n",
+    "quoted": HEADER + '\n"Lamp, brass","$ 1,200",\"Says \"\"hi\"\"\",,,, Lights ,Out\n  padded  , 3 ,,,,,Lights,\n',
+    "prices": HEADER + "\n" + "".join(f"P{i},{p},,,,,,\n" for i, p in enumerate(["$ 10", "10", "free", "", "1.2.3", "$ 3", "$ 10", "99.99", "0.5"])),
+    "dupes": HEADER + "\nA,1,,,,,X,\nB,2,,,,,Y,\nA,3,,,,,Z,\nb,2,,,,,Y,\n",
+}
+
+
+def build_catalog_js(texts):
+    script = CSV_LINE_JS + CATALOG_JS + "\nprocess.stdout.write(JSON.stringify(JSON.parse(require('fs').readFileSync(0, 'utf8')).map(t => buildCatalog(t.split(/\\r\\n|\\n/)))));"
+    out = subprocess.run(["node", "-e", script], input=json.dumps(texts), capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node is not installed")
+def test_python_and_js_build_the_same_catalog():
+    for (name, text), js in zip(CASES.items(), build_catalog_js(list(CASES.values()))):
+        catalog, _ = index_catalog(io.StringIO(text))
+        assert json.loads(json.dumps(catalog)) == js, name
+
+
+def test_columns_past_h_are_ignored():
+    catalog, report = index_catalog(io.StringIO(CASES["over_wide"]))
+    assert catalog["rows"][0] == ["Item 0", "$ 0.00", 0.0, "Thing 0", "", "", "", "Cat 0", 1]
+    assert report == {"total": 8, "dupes": [], "bad_price": 0}